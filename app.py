@@ -1,12 +1,41 @@
-from flask import Flask, request, jsonify, send_from_directory
+import time
+from startup import StartupReport
+
+# Times the imports below and the startup phases; printed once ready and
+# exported on /api/metrics to catch cold-start regressions
+startup = StartupReport().track_imports()
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 from model import IPLAuctionPredictor
+from model_manager import ModelManager
+from prediction_cache import PredictionCache
+from batching import MicroBatcher
+from dataset_cache import DatasetCache
+from synthetic import generate_players, to_records
+from similarity import SimilarityIndexCache
+from valuations import ValuationCache
+from metrics import MetricsRegistry, STAGE_BUCKETS
+from profiling import install_request_profiler
+from static_files import StaticIndex
+import json_codec
+import hmac
 import os
-import pandas as pd
 import numpy as np
 from werkzeug.utils import secure_filename
 
-app = Flask(__name__, static_folder='frontend/build', static_url_path='')
+# pandas and sklearn are not imported above; they load on the first
+# training, dataset or CSV request
+startup.stop_tracking()
+
+# The built frontend is served by serve() from an in-memory index rather
+# than Flask's static route
+app = Flask(__name__, static_folder=None)
+FRONTEND_BUILD_DIR = os.path.join(app.root_path, 'frontend', 'build')
+static_index = StaticIndex(FRONTEND_BUILD_DIR, float(os.environ.get('STATIC_RECHECK_SECONDS', 2)))
+
+# orjson for request/response bodies when installed, stdlib json otherwise
+json_codec.install(app)
 
 # CORS configuration for production
 if os.environ.get('RENDER'):
@@ -32,56 +61,220 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 # Create upload folder if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Initialize predictor
-predictor = IPLAuctionPredictor()
+# Repeated players skip scoring (PREDICTION_CACHE_SIZE=0 disables)
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 4096))
+PREDICTION_CACHE_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', 0)) or None
+prediction_cache = PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL) if PREDICTION_CACHE_SIZE > 0 else None
+
+# Optional coalescing of concurrent /api/predict calls into batched scoring
+if os.environ.get('PREDICT_BATCHING', '').lower() in ('1', 'true', 'yes'):
+    predict_batcher = MicroBatcher(
+        max_batch_size=int(os.environ.get('PREDICT_BATCH_MAX_SIZE', 64)),
+        max_wait_ms=float(os.environ.get('PREDICT_BATCH_MAX_WAIT_MS', 0.2))
+    )
+else:
+    predict_batcher = None
+
+# Prometheus metrics served at /api/metrics
+metrics = MetricsRegistry()
+request_latency = metrics.histogram(
+    'ipl_http_request_duration_seconds', 'Request latency by route', ['route', 'method'])
+request_count = metrics.counter(
+    'ipl_http_requests_total', 'Requests by route, method and status', ['route', 'method', 'status'])
+error_count = metrics.counter(
+    'ipl_http_request_errors_total', 'Responses with status >= 400', ['route', 'method'])
+predict_stages = metrics.histogram(
+    'ipl_predict_stage_seconds', 'Time spent in each prediction stage', ['stage'], buckets=STAGE_BUCKETS)
+
+def create_predictor():
+    # IPL_KERNEL_DTYPE=float32 for higher batch throughput
+    predictor = IPLAuctionPredictor(kernel_dtype=os.environ.get('IPL_KERNEL_DTYPE', 'float64'))
+    predictor.prediction_cache = prediction_cache
+    predictor.batcher = predict_batcher
+    predictor.stage_timer = predict_stages
+    return predictor
+
+# Initialize predictor. With MODEL_POLL_INTERVAL seconds > 0, newly saved
+# artifacts are picked up and swapped in without a restart.
+MODEL_DIR = os.environ.get('MODEL_DIR', 'model_artifacts')
+model_manager = ModelManager(
+    MODEL_DIR,
+    create_predictor,
+    poll_interval=float(os.environ.get('MODEL_POLL_INTERVAL', 0))
+)
+if prediction_cache is not None:
+    model_manager.add_swap_listener(lambda predictor: prediction_cache.clear())
+
+metrics.gauge('ipl_model_load_seconds', 'Time to load and validate the live model',
+              lambda: model_manager.last_load_seconds)
+metrics.counter_from('ipl_model_loads_total', 'Model load attempts by result',
+                     lambda: {('success',): model_manager.loads, ('failure',): model_manager.load_failures},
+                     ['result'])
+metrics.gauge('ipl_model_info', 'Version of the live model',
+              lambda: {(model_manager.predictor.model_version,): 1}, ['version'])
+if prediction_cache is not None:
+    metrics.counter_from('ipl_prediction_cache_lookups_total', 'Prediction cache lookups by result',
+                         lambda: {('hit',): prediction_cache.hits, ('miss',): prediction_cache.misses},
+                         ['result'])
 
 # Load trained model
 try:
-    predictor.load_model('model_artifacts')
+    model_manager.load()
+    startup.phase('model_load', model_manager.last_load_seconds)
     print("Model loaded successfully!")
 except Exception as e:
     print(f"Error loading model: {e}")
     print("Please train the model first by running: python model.py")
 
+# Parsed dataset shared by the stats/sample endpoints, reloaded on change
+DATASET_PATH = 'players_dataset.csv'
+dataset_cache = DatasetCache(DATASET_PATH)
+
+# Upper bound for /api/generate-demo-data?n=
+DEMO_DATA_MAX_PLAYERS = int(os.environ.get('DEMO_DATA_MAX_PLAYERS', 10000))
+
+# Largest grid /api/what-if will score in one call
+WHAT_IF_MAX_VARIANTS = int(os.environ.get('WHAT_IF_MAX_VARIANTS', 50000))
+
+# Nearest-neighbour index over the dataset, rebuilt when the dataset or model changes
+SIMILAR_PLAYERS_MAX_K = 50
+similarity_index = SimilarityIndexCache(dataset_cache, model_manager)
+
+# Whole dataset scored once per model/dataset version for /api/rankings
+RANKINGS_MAX_PER_PAGE = 100
+valuation_cache = ValuationCache(dataset_cache, model_manager)
+model_manager.add_swap_listener(lambda predictor: valuation_cache.refresh())
+
+def warm_caches():
+    """Load the dataset and build the similarity, ranking and frontend indexes now
+
+    Importing the app leaves them to the first request that needs them,
+    which keeps cold start short. serve.py and `python app.py` call this
+    before taking traffic.
+    """
+    with startup.timed('warm_caches'):
+        for name, build in (
+            ('Similarity index', similarity_index.get),
+            ('Valuation table', valuation_cache.get),
+            ('Frontend index', static_index.files)
+        ):
+            try:
+                build()
+            except Exception as e:
+                print(f"{name} not built yet: {e}")
+
+metrics.gauge('ipl_startup_seconds', 'Time from first import until ready, and per startup phase',
+              lambda: {(name,): seconds for name, seconds in {'total': startup.ready_seconds, **startup.phases}.items()},
+              ['phase'])
+metrics.gauge('ipl_startup_import_seconds', 'Import time per top-level module during startup',
+              lambda: {(name,): seconds for name, seconds in startup.imports.items()}, ['module'])
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+@app.before_request
+def start_model_polling():
+    model_manager.ensure_polling()
+
+@app.before_request
+def start_static_polling():
+    static_index.ensure_polling()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.get('request_started')
+    if started is not None:
+        # Route templates, not raw paths, keep the label set bounded
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        method = request.method
+        
+        def observe_latency():
+            request_latency.observe(time.perf_counter() - started, route, method)
+        
+        # A streamed body is produced after this hook returns, so time it
+        # until the response is closed
+        if response.is_streamed:
+            response.call_on_close(observe_latency)
+        else:
+            observe_latency()
+        request_count.inc(route, request.method, response.status_code)
+        if response.status_code >= 400:
+            error_count.inc(route, request.method)
+    return response
+
+# Opt-in profiling of single requests (X-Profile: 1 or ?profile=1), off
+# unless PROFILE_REQUESTS is set so normal requests pay nothing
+if os.environ.get('PROFILE_REQUESTS', '').lower() in ('1', 'true', 'yes'):
+    install_request_profiler(
+        app,
+        os.environ.get('PROFILE_DIR', 'profiles'),
+        interval=float(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', 1)) / 1000.0
+    )
+
+@app.route('/api/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Metrics in the Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'model_loaded': predictor.is_trained
+        **model_manager.status(),
+        'prediction_cache': prediction_cache.stats() if prediction_cache is not None else None,
+        'batcher': predict_batcher.stats() if predict_batcher is not None else None
     })
 
+@app.route('/api/admin/reload-model', methods=['POST'])
+def reload_model():
+    """Load, validate and swap in the current model artifacts
+
+    Disabled unless ADMIN_TOKEN is set; the token goes in X-Admin-Token.
+    """
+    admin_token = os.environ.get('ADMIN_TOKEN')
+    if not admin_token:
+        return jsonify({
+            'success': False,
+            'error': 'Admin endpoints are disabled'
+        }), 403
+    
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), admin_token):
+        return jsonify({
+            'success': False,
+            'error': 'Invalid admin token'
+        }), 403
+    
+    try:
+        reloaded = model_manager.load()
+        return jsonify({
+            'success': True,
+            'reloaded': reloaded,
+            **model_manager.status()
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Reload failed, previous model kept: {str(e)}',
+            **model_manager.status()
+        }), 500
+
 @app.route('/api/predict', methods=['POST'])
 def predict():
     """Predict auction price for a player"""
     try:
+        started = time.perf_counter()
         data = request.json
+        predict_stages.observe(time.perf_counter() - started, 'parse')
         
-        # Validate required fields
-        required_fields = [
-            'age', 'role', 'country', 'batting_style', 'bowling_style',
-            'domestic_matches', 'innings_batted', 'runs_scored',
-            'batting_average', 'batting_strike_rate', 'hundreds', 'fifties',
-            'highest_score', 'boundary_percentage', 'overs_bowled',
-            'wickets_taken', 'bowling_average', 'economy_rate',
-            'bowling_strike_rate', 'five_wicket_hauls', 'best_bowling_wickets',
-            'dot_ball_percentage', 'catches', 'stumpings',
-            'consistency_rating', 'fitness_score', 'experience_factor',
-            'recent_form_rating', 'match_winning_performances',
-            'pressure_handling_score'
-        ]
-        
-        # Convert numeric fields
-        numeric_fields = [f for f in required_fields if f not in ['role', 'country', 'batting_style', 'bowling_style']]
-        for field in numeric_fields:
-            if field in data:
-                data[field] = float(data[field])
-        
-        # Make prediction
-        result = predictor.predict(data)
+        # The model's schema checks and coerces every field in one pass;
+        # unknown categories are scored with a fallback and reported
+        result = model_manager.predictor.predict(data)
         
         return jsonify({
             'success': True,
@@ -94,28 +287,82 @@ def predict():
             'error': str(e)
         }), 400
 
+@app.route('/api/predict-batch', methods=['POST'])
+def predict_batch():
+    """Predict auction prices for a batch of players"""
+    try:
+        started = time.perf_counter()
+        data = request.json
+        predict_stages.observe(time.perf_counter() - started, 'parse')
+        
+        # Accept a bare array of players, or {"players": [...]} where players
+        # is either an array of player objects or an object of columns
+        if isinstance(data, dict) and 'players' in data:
+            players = data['players']
+        else:
+            players = data
+        
+        if not isinstance(players, (list, dict)):
+            raise ValueError('Expected a JSON array of players or an object of columns')
+        
+        results = model_manager.predictor.predict_batch(players)
+        failed = sum(1 for r in results if not r['success'])
+        
+        return jsonify({
+            'success': True,
+            'predictions': results,
+            'total': len(results),
+            'failed': failed
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/what-if', methods=['POST'])
+def what_if():
+    """Price surface of a player over one or two varied features
+
+    Body: {"player": {...}, "grid": {"batting_strike_rate": [130, 140, ...]}}
+    where a grid may also be {"start": 130, "stop": 160, "num": 31}.
+    """
+    try:
+        data = request.json
+        if not isinstance(data, dict) or not isinstance(data.get('player'), dict):
+            raise ValueError('Expected {"player": {...}, "grid": {...}}')
+        
+        predictor = model_manager.predictor
+        result = predictor.what_if(data['player'], data.get('grid'), max_variants=WHAT_IF_MAX_VARIANTS)
+        
+        return jsonify({
+            'success': True,
+            'base': predictor.predict(data['player']),
+            **result
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
 @app.route('/api/dataset-stats', methods=['GET'])
 def dataset_stats():
     """Get dataset statistics"""
     try:
-        df = pd.read_csv('players_dataset.csv')
-        
-        stats = {
-            'total_players': len(df),
-            'avg_price': round(df['auction_price_lakhs'].mean(), 2),
-            'max_price': round(df['auction_price_lakhs'].max(), 2),
-            'min_price': round(df['auction_price_lakhs'].min(), 2),
-            'role_distribution': df['role'].value_counts().to_dict(),
-            'country_distribution': df['country'].value_counts().to_dict(),
-            'avg_age': round(df['age'].mean(), 2),
-            'total_runs': int(df['runs_scored'].sum()),
-            'total_wickets': int(df['wickets_taken'].sum())
-        }
+        snapshot = dataset_cache.get()
         
-        return jsonify({
+        response = jsonify({
             'success': True,
-            'stats': stats
+            'stats': snapshot.stats
         })
+        
+        # Stats only change with the file, let clients revalidate for a 304
+        response.set_etag(snapshot.etag)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     
     except Exception as e:
         return jsonify({
@@ -127,16 +374,10 @@ def dataset_stats():
 def sample_players():
     """Get sample players for reference"""
     try:
-        df = pd.read_csv('players_dataset.csv')
+        snapshot = dataset_cache.get()
         
         # Get diverse samples
-        samples = []
-        for role in df['role'].unique():
-            role_df = df[df['role'] == role]
-            sample = role_df.sample(min(2, len(role_df)))
-            samples.append(sample)
-        
-        result_df = pd.concat(samples)
+        result_df = snapshot.sample_by_role(per_role=2)
         
         return jsonify({
             'success': True,
@@ -149,93 +390,106 @@ def sample_players():
             'error': str(e)
         }), 400
 
-@app.route('/api/generate-demo-data', methods=['GET'])
-def generate_demo_data():
-    """Generate realistic demo data for testing"""
+@app.route('/api/similar-players', methods=['POST'])
+def similar_players():
+    """Find the dataset players most similar to a player
+
+    Takes the same player JSON as /api/predict; ?k= sets how many
+    neighbours to return (default 5).
+    """
     try:
-        # Define realistic ranges for different roles
-        role = np.random.choice(['Batsman', 'Bowler', 'All-Rounder', 'Wicket-Keeper'])
-        country = np.random.choice(['India', 'Australia', 'England', 'South Africa', 'New Zealand', 
-                                   'West Indies', 'Pakistan', 'Sri Lanka', 'Bangladesh', 'Afghanistan'])
-        
-        demo_data = {
-            'age': np.random.randint(20, 38),
-            'role': role,
-            'country': country,
-            'batting_style': np.random.choice(['Right-Hand', 'Left-Hand']),
-            'bowling_style': np.random.choice(['Right-Arm Fast', 'Left-Arm Fast', 'Right-Arm Medium', 
-                                              'Left-Arm Medium', 'Right-Arm Spin', 'Left-Arm Spin', 
-                                              'Leg-Spin', 'Off-Spin']),
-            'domestic_matches': int(np.random.randint(50, 250)),
-        }
+        k = request.args.get('k', 5, type=int)
+        if not 1 <= k <= SIMILAR_PLAYERS_MAX_K:
+            raise ValueError(f"k must be between 1 and {SIMILAR_PLAYERS_MAX_K}")
         
-        # Role-specific stats
-        if role in ['Batsman', 'All-Rounder', 'Wicket-Keeper']:
-            demo_data.update({
-                'innings_batted': int(np.random.randint(40, 200)),
-                'runs_scored': int(np.random.randint(800, 8000)),
-                'batting_average': round(np.random.uniform(20.0, 55.0), 2),
-                'batting_strike_rate': round(np.random.uniform(110.0, 180.0), 2),
-                'hundreds': int(np.random.randint(0, 15)),
-                'fifties': int(np.random.randint(0, 40)),
-                'highest_score': int(np.random.randint(50, 180)),
-                'boundary_percentage': round(np.random.uniform(8.0, 25.0), 2),
-            })
-        else:  # Bowler - lower batting stats
-            demo_data.update({
-                'innings_batted': int(np.random.randint(10, 80)),
-                'runs_scored': int(np.random.randint(50, 1500)),
-                'batting_average': round(np.random.uniform(8.0, 25.0), 2),
-                'batting_strike_rate': round(np.random.uniform(80.0, 140.0), 2),
-                'hundreds': 0,
-                'fifties': int(np.random.randint(0, 3)),
-                'highest_score': int(np.random.randint(15, 65)),
-                'boundary_percentage': round(np.random.uniform(5.0, 15.0), 2),
-            })
-        
-        # Bowling stats
-        if role in ['Bowler', 'All-Rounder']:
-            demo_data.update({
-                'overs_bowled': round(np.random.uniform(200.0, 1200.0), 1),
-                'wickets_taken': int(np.random.randint(30, 350)),
-                'bowling_average': round(np.random.uniform(18.0, 35.0), 2),
-                'economy_rate': round(np.random.uniform(6.5, 9.5), 2),
-                'bowling_strike_rate': round(np.random.uniform(15.0, 25.0), 2),
-                'five_wicket_hauls': int(np.random.randint(0, 8)),
-                'best_bowling_wickets': int(np.random.randint(3, 7)),
-                'dot_ball_percentage': round(np.random.uniform(35.0, 55.0), 2),
-            })
-        else:  # Batsman/WK - minimal bowling
-            demo_data.update({
-                'overs_bowled': round(np.random.uniform(0.0, 50.0), 1),
-                'wickets_taken': int(np.random.randint(0, 15)),
-                'bowling_average': round(np.random.uniform(25.0, 45.0), 2),
-                'economy_rate': round(np.random.uniform(7.0, 11.0), 2),
-                'bowling_strike_rate': round(np.random.uniform(18.0, 35.0), 2),
-                'five_wicket_hauls': 0,
-                'best_bowling_wickets': int(np.random.randint(0, 3)),
-                'dot_ball_percentage': round(np.random.uniform(25.0, 45.0), 2),
-            })
-        
-        # Fielding stats
-        demo_data.update({
-            'catches': int(np.random.randint(10, 120)),
-            'stumpings': int(np.random.randint(0, 40) if role == 'Wicket-Keeper' else np.random.randint(0, 3)),
+        index = similarity_index.get()
+        rows, distances = index.query(request.json, k)
+        
+        players = index.df.iloc[rows].to_dict('records')
+        for player, distance in zip(players, distances):
+            player['distance'] = round(float(distance), 4)
+        
+        prices = index.df['auction_price_lakhs'].to_numpy(dtype=np.float64)[rows]
+        return jsonify({
+            'success': True,
+            'players': players,
+            'price_summary': {
+                'mean': round(float(prices.mean()), 2),
+                'median': round(float(np.median(prices)), 2),
+                'min': round(float(prices.min()), 2),
+                'max': round(float(prices.max()), 2)
+            }
         })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/rankings', methods=['GET'])
+def rankings():
+    """Ranked players from the precomputed valuation table
+
+    Query: role, country, sort (predicted_price, confidence, actual_price,
+    residual), order (desc/asc), page, per_page. Sorting by residual
+    ascending lists the most undervalued players first.
+    """
+    try:
+        order = request.args.get('order', 'desc')
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        per_page = request.args.get('per_page', 20, type=int)
+        if not 1 <= per_page <= RANKINGS_MAX_PER_PAGE:
+            raise ValueError(f"per_page must be between 1 and {RANKINGS_MAX_PER_PAGE}")
+        page = request.args.get('page', 1, type=int)
+        
+        table, stale = valuation_cache.get()
+        players, total = table.query(
+            role=request.args.get('role'),
+            country=request.args.get('country'),
+            sort=request.args.get('sort', 'predicted_price'),
+            descending=order == 'desc',
+            page=page,
+            per_page=per_page
+        )
         
-        # Performance metrics (0-100 scale)
-        demo_data.update({
-            'consistency_rating': round(np.random.uniform(40.0, 95.0), 2),
-            'fitness_score': round(np.random.uniform(60.0, 98.0), 2),
-            'experience_factor': round(np.random.uniform(30.0, 95.0), 2),
-            'recent_form_rating': round(np.random.uniform(40.0, 95.0), 2),
-            'match_winning_performances': int(np.random.randint(0, 25)),
-            'pressure_handling_score': round(np.random.uniform(45.0, 98.0), 2),
+        return jsonify({
+            'success': True,
+            'players': players,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'pages': (total + per_page - 1) // per_page,
+            'model_version': table.model_version,
+            'stale': stale
         })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/generate-demo-data', methods=['GET'])
+def generate_demo_data():
+    """Generate realistic demo data for testing
+
+    ?n= returns a list of that many players, ?seed= makes the output
+    reproducible. Without n a single player dict is returned.
+    """
+    try:
+        n = request.args.get('n', type=int)
+        seed = request.args.get('seed', type=int)
+        if n is not None and not 1 <= n <= DEMO_DATA_MAX_PLAYERS:
+            raise ValueError(f"n must be between 1 and {DEMO_DATA_MAX_PLAYERS}")
+        
+        rng = np.random.default_rng(seed)
+        players = to_records(generate_players(n or 1, rng))
         
         return jsonify({
             'success': True,
-            'data': demo_data
+            'data': players if n is not None else players[0]
         })
     
     except Exception as e:
@@ -244,9 +498,150 @@ def generate_demo_data():
             'error': str(e)
         }), 400
 
+# Expected columns mapping (CSV column -> form field)
+CSV_COLUMN_MAPPING = {
+    'player_name': 'player_name',
+    'age': 'age',
+    'role': 'role',
+    'country': 'country',
+    'batting_style': 'batting_style',
+    'bowling_style': 'bowling_style',
+    'domestic_matches': 'domestic_matches',
+    'innings_batted': 'innings_batted',
+    'runs_scored': 'runs_scored',
+    'batting_average': 'batting_average',
+    'batting_strike_rate': 'batting_strike_rate',
+    'hundreds': 'hundreds',
+    'fifties': 'fifties',
+    'highest_score': 'highest_score',
+    'boundary_percentage': 'boundary_percentage',
+    'overs_bowled': 'overs_bowled',
+    'wickets_taken': 'wickets_taken',
+    'bowling_average': 'bowling_average',
+    'economy_rate': 'economy_rate',
+    'bowling_strike_rate': 'bowling_strike_rate',
+    'five_wicket_hauls': 'five_wicket_hauls',
+    'best_bowling_wickets': 'best_bowling_wickets',
+    'dot_ball_percentage': 'dot_ball_percentage',
+    'catches': 'catches',
+    'stumpings': 'stumpings',
+    'consistency_rating': 'consistency_rating',
+    'fitness_score': 'fitness_score',
+    'experience_factor': 'experience_factor',
+    'recent_form_rating': 'recent_form_rating',
+    'match_winning_performances': 'match_winning_performances',
+    'pressure_handling_score': 'pressure_handling_score'
+}
+
+CSV_TEXT_FIELDS = ['role', 'country', 'batting_style', 'bowling_style', 'player_name']
+
+# Default values for missing columns
+CSV_DEFAULTS = {
+    'role': 'Batsman',
+    'country': 'India',
+    'batting_style': 'Right-Hand',
+    'bowling_style': 'Right-Arm Fast'
+}
+
+# Rows parsed and scored per step when scoring a whole upload
+CSV_SCORE_CHUNKSIZE = 2000
+
+def format_csv_frame(df, for_scoring=False):
+    """Map uploaded CSV columns onto form fields for every row of df
+
+    for_scoring leaves NaN in text columns so they encode the same way as
+    during training, and keeps numeric columns as floats. Otherwise
+    missing and non-numeric values become the int 0, as the form expects.
+    """
+    import pandas as pd
+    
+    formatted = {}
+    missing_columns = []
+    
+    for csv_col, form_field in CSV_COLUMN_MAPPING.items():
+        if csv_col not in df.columns:
+            missing_columns.append(csv_col)
+            continue
+        
+        column = df[csv_col]
+        if form_field in CSV_TEXT_FIELDS:
+            # NaN values become 0, everything else its string form
+            missing_text = float('nan') if for_scoring else 0
+            formatted[form_field] = column.astype(str).where(column.notna(), missing_text)
+        else:
+            # Non-numeric values and NaN become 0
+            numbers = pd.to_numeric(column, errors='coerce').astype(float)
+            if for_scoring:
+                formatted[form_field] = numbers.fillna(0)
+            else:
+                formatted[form_field] = numbers.astype(object).where(numbers.notna(), 0)
+    
+    for form_field, default in CSV_DEFAULTS.items():
+        formatted.setdefault(form_field, default)
+    
+    return pd.DataFrame(formatted, index=df.index), missing_columns
+
+def stream_csv_predictions(reader, scorer):
+    """Score CSV chunks as they are parsed and yield NDJSON lines"""
+    total_rows = 0
+    failed = 0
+    missing_columns = None
+    
+    chunks = iter(reader)
+    while True:
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            break
+        except Exception as e:
+            yield json_codec.dumps({'success': False, 'error': f'Error reading CSV file: {str(e)}'}) + '\n'
+            return
+        
+        try:
+            formatted, missing_columns = format_csv_frame(chunk, for_scoring=True)
+            results = scorer.predict_batch(formatted)
+            names = None
+            if 'player_name' in formatted:
+                names = [name if isinstance(name, str) else None for name in formatted['player_name'].tolist()]
+            
+            lines = []
+            for i, result in enumerate(results):
+                line = {'row': total_rows + i}
+                if names is not None:
+                    line['player_name'] = names[i]
+                if result['success']:
+                    line.update(success=True, prediction=result['prediction'])
+                else:
+                    failed += 1
+                    line.update(success=False, error=result['error'])
+                lines.append(json_codec.dumps(line))
+        
+        except Exception as e:
+            yield json_codec.dumps({
+                'success': False,
+                'error': f'Error scoring rows {total_rows}-{total_rows + len(chunk) - 1}: {str(e)}'
+            }) + '\n'
+            return
+        
+        total_rows += len(chunk)
+        yield '\n'.join(lines) + '\n'
+    
+    yield json_codec.dumps({
+        'done': True,
+        'total_rows': total_rows,
+        'failed': failed,
+        'missing_columns': missing_columns if missing_columns else None
+    }) + '\n'
+
 @app.route('/api/upload-csv', methods=['POST'])
 def upload_csv():
-    """Upload and parse CSV file with player data"""
+    """Upload and parse CSV file with player data
+
+    With ?score=all every row is priced and streamed back as NDJSON, one
+    line per row followed by a summary line.
+    """
+    import pandas as pd
+    
     try:
         # Check if file is in request
         if 'file' not in request.files:
@@ -271,6 +666,22 @@ def upload_csv():
                 'error': 'Invalid file type. Please upload a CSV file.'
             }), 400
         
+        if request.args.get('score') == 'all':
+            # Parse lazily so memory stays flat and rows stream back early
+            try:
+                chunksize = int(request.args.get('chunksize', CSV_SCORE_CHUNKSIZE))
+                reader = pd.read_csv(file, chunksize=max(1, chunksize))
+            except Exception as e:
+                return jsonify({
+                    'success': False,
+                    'error': f'Error reading CSV file: {str(e)}'
+                }), 400
+            
+            return Response(
+                stream_with_context(stream_csv_predictions(reader, model_manager.predictor)),
+                mimetype='application/x-ndjson'
+            )
+        
         # Read CSV file
         try:
             df = pd.read_csv(file)
@@ -287,76 +698,9 @@ def upload_csv():
                 'error': 'CSV file is empty'
             }), 400
         
-        # Get first row of data
-        player_data = df.iloc[0].to_dict()
-        
-        # Define expected columns mapping (CSV column -> form field)
-        column_mapping = {
-            'player_name': 'player_name',
-            'age': 'age',
-            'role': 'role',
-            'country': 'country',
-            'batting_style': 'batting_style',
-            'bowling_style': 'bowling_style',
-            'domestic_matches': 'domestic_matches',
-            'innings_batted': 'innings_batted',
-            'runs_scored': 'runs_scored',
-            'batting_average': 'batting_average',
-            'batting_strike_rate': 'batting_strike_rate',
-            'hundreds': 'hundreds',
-            'fifties': 'fifties',
-            'highest_score': 'highest_score',
-            'boundary_percentage': 'boundary_percentage',
-            'overs_bowled': 'overs_bowled',
-            'wickets_taken': 'wickets_taken',
-            'bowling_average': 'bowling_average',
-            'economy_rate': 'economy_rate',
-            'bowling_strike_rate': 'bowling_strike_rate',
-            'five_wicket_hauls': 'five_wicket_hauls',
-            'best_bowling_wickets': 'best_bowling_wickets',
-            'dot_ball_percentage': 'dot_ball_percentage',
-            'catches': 'catches',
-            'stumpings': 'stumpings',
-            'consistency_rating': 'consistency_rating',
-            'fitness_score': 'fitness_score',
-            'experience_factor': 'experience_factor',
-            'recent_form_rating': 'recent_form_rating',
-            'match_winning_performances': 'match_winning_performances',
-            'pressure_handling_score': 'pressure_handling_score'
-        }
-        
-        # Extract and format data
-        formatted_data = {}
-        missing_columns = []
-        
-        for csv_col, form_field in column_mapping.items():
-            if csv_col in player_data:
-                value = player_data[csv_col]
-                # Handle NaN values
-                if pd.isna(value):
-                    formatted_data[form_field] = 0
-                else:
-                    # Convert to appropriate type
-                    if form_field in ['role', 'country', 'batting_style', 'bowling_style', 'player_name']:
-                        formatted_data[form_field] = str(value)
-                    else:
-                        try:
-                            # Try to convert to number
-                            formatted_data[form_field] = float(value)
-                        except:
-                            formatted_data[form_field] = 0
-            else:
-                missing_columns.append(csv_col)
-        
-        # Set default values for missing columns
-        if 'role' not in formatted_data:
-            formatted_data['role'] = 'Batsman'
-        if 'country' not in formatted_data:
-            formatted_data['country'] = 'India'
-        if 'batting_style' not in formatted_data:
-            formatted_data['batting_style'] = 'Right-Hand'
-        if 'bowling_style' not in formatted_data:
-            formatted_data['bowling_style'] = 'Right-Arm Fast'
+        # Extract and format the first row of data
+        formatted, missing_columns = format_csv_frame(df.iloc[:1])
+        formatted_data = formatted.iloc[0].to_dict()
         
         return jsonify({
             'success': True,
@@ -376,14 +720,12 @@ def upload_csv():
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    # Check if we're serving a built frontend
-    if app.static_folder and os.path.exists(app.static_folder):
-        if path != "" and os.path.exists(os.path.join(app.static_folder, path)):
-            return send_from_directory(app.static_folder, path)
-        else:
-            index_path = os.path.join(app.static_folder, 'index.html')
-            if os.path.exists(index_path):
-                return send_from_directory(app.static_folder, 'index.html')
+    # Built frontend files come from the in-memory index (gzip, ETag, 304);
+    # any other path gets index.html so client-side routes work
+    files = static_index.files()
+    static_file = files.get(path) or files.get('index.html')
+    if static_file is not None:
+        return static_file.response(request)
     
     # If no frontend build exists, return API info
     return jsonify({
@@ -391,16 +733,25 @@ def serve(path):
         'status': 'Backend running',
         'endpoints': {
             'health': '/api/health',
+            'metrics': '/api/metrics',
             'predict': '/api/predict (POST)',
+            'predict_batch': '/api/predict-batch (POST)',
+            'what_if': '/api/what-if (POST)',
             'stats': '/api/dataset-stats',
-            'demo': '/api/generate-demo-data',
-            'upload': '/api/upload-csv (POST)'
+            'similar': '/api/similar-players (POST, ?k=)',
+            'rankings': '/api/rankings (?role=&country=&sort=&order=&page=)',
+            'demo': '/api/generate-demo-data (?n= for many players)',
+            'upload': '/api/upload-csv (POST, ?score=all streams NDJSON)'
         }
     })
 
+startup.ready()
+print(startup.summary())
+
 if __name__ == '__main__':
     # Get port from environment variable (for Render)
     port = int(os.environ.get('PORT', 5000))
+    warm_caches()
     
     # Run on localhost or production
     if os.environ.get('RENDER'):
@@ -417,9 +768,14 @@ if __name__ == '__main__':
         print(f"Server running on: http://localhost:{port}")
         print("API Endpoints:")
         print("  - GET  /api/health         : Health check")
+        print("  - GET  /api/metrics        : Prometheus metrics")
         print("  - POST /api/predict        : Predict player price")
+        print("  - POST /api/predict-batch  : Predict prices for many players")
+        print("  - POST /api/what-if        : Price surface over feature grids")
         print("  - GET  /api/dataset-stats  : Get dataset statistics")
         print("  - GET  /api/sample-players : Get sample players")
+        print("  - POST /api/similar-players : Find comparable players")
+        print("  - GET  /api/rankings       : Ranked players by role/country")
         print("  - GET  /api/generate-demo-data : Generate demo data")
         print("  - POST /api/upload-csv     : Upload player CSV")
         print("="*60)
@@ -0,0 +1,285 @@
+"""Monte Carlo simulation of a full IPL auction
+
+Every player's price distribution comes from the model: a price bin is
+drawn from the per-bin probabilities of predict_proba and a price drawn
+uniformly inside that bin's edges. Each team values the player at that
+price times its own log-normal noise, and the player goes to the highest
+valuation among teams that can still take him (squad size, overseas
+slots, role minimums, purse left after reserving base prices for the
+minimum squad) at the second-highest valuation, like an English auction.
+A team only bids for a player if the squad places it has left after him
+can still cover the wicket-keepers, bowlers and other roles it is short of.
+
+Simulations are vectorized: each step of the auction is processed for a
+whole chunk of simulations at once. Chunks are spread over a process pool
+with their own SeedSequence children, so results depend only on the seed
+and chunk size, never on the number of workers.
+
+Usage:
+    python auction_sim.py [--pool players.csv | --players 250] [--sims 10000]
+                          [--seed 42] [--workers 8] [--teams teams.json]
+                          [--output results.json]
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from columnar import load_dataset
+from model import IPLAuctionPredictor
+
+TEAMS = ['CSK', 'MI', 'RCB', 'KKR', 'DC', 'PBKS', 'RR', 'SRH', 'GT', 'LSG']
+PURSE_LAKHS = 12000.0
+MAX_SQUAD = 25
+MIN_SQUAD = 18
+MAX_OVERSEAS = 8
+BASE_PRICE_LAKHS = 20.0
+HOME_COUNTRY = 'India'
+
+# Fewest players of each role a squad must end up with
+ROLE_MINIMUMS = {'Batsman': 4, 'Bowler': 5, 'All-Rounder': 2, 'Wicket-Keeper': 2}
+ROLES = list(ROLE_MINIMUMS)
+
+# Spread of team valuations around the sampled price (log-normal sigma)
+VALUATION_SPREAD = 0.25
+
+# Simulations per task; part of what the seed reproduces
+CHUNK_SIZE = 500
+
+
+class PlayerPool:
+    """Per-player price distributions for the auction pool"""
+
+    def __init__(self, df, predictor):
+        X, known = predictor._encode_frame(df)
+        if not known.all():
+            print(f"Skipping {int((~known).sum())} players with categories unknown to the model")
+        df = df[known]
+        self.names = (df['player_name'].astype(str).tolist() if 'player_name' in df.columns
+                      else [f'Player {i + 1}' for i in range(len(df))])
+        self.overseas = (df['country'].astype(str) != HOME_COUNTRY).to_numpy()
+        # Index into ROLES, len(ROLES) for a role with no minimum
+        role_index = {role: i for i, role in enumerate(ROLES)}
+        self.role = np.array([role_index.get(role, len(ROLES)) for role in df['role'].astype(str)])
+
+        proba = predictor._kernel.predict_proba(X[known])
+        self.cumulative = np.cumsum(proba, axis=1)
+        self.cumulative[:, -1] = 1.0
+
+        # Price edges of each class's bin. Classes run 0..n_bins-1, so
+        # every class has both edges; the clamp only guards odd bin tables
+        bins = np.asarray(predictor.price_bins, dtype=np.float64)
+        classes = predictor._kernel.classes
+        self.low = bins[classes]
+        self.high = bins[np.minimum(classes + 1, len(bins) - 1)]
+        self.predicted_price = np.array([
+            prediction['predicted_price'] for prediction in predictor._format_predictions(proba)
+        ])
+
+    def __len__(self):
+        return len(self.names)
+
+
+def _teams(config=None):
+    """Team names with their starting purse, squad size, overseas count
+    and players already held per role (columns in ROLES order)"""
+    if config is None:
+        config = [{'name': name} for name in TEAMS]
+    if len(config) < 2:
+        raise ValueError("An auction needs at least two teams")
+    return (
+        [team['name'] for team in config],
+        np.array([float(team.get('purse', PURSE_LAKHS)) for team in config]),
+        np.array([int(team.get('squad', 0)) for team in config]),
+        np.array([int(team.get('overseas', 0)) for team in config]),
+        np.array([[int(team.get('roles', {}).get(role, 0)) for role in ROLES] for team in config])
+    )
+
+
+def simulate_chunk(pool, purse, squad, overseas, roles, n_sims, seed):
+    """Run n_sims auctions; returns (prices paid per player, buyer per player)
+
+    Prices are NaN and buyers -1 where the player went unsold.
+    """
+    rng = np.random.default_rng(seed)
+    n_players = len(pool.overseas)
+    n_teams = len(purse)
+    sims = np.arange(n_sims)
+
+    purse = np.tile(purse, (n_sims, 1))
+    squad = np.tile(squad, (n_sims, 1))
+    overseas = np.tile(overseas, (n_sims, 1))
+    # Extra last column counts players whose role has no minimum
+    roles = np.concatenate([roles, np.zeros((n_teams, 1), dtype=roles.dtype)], axis=1)
+    roles = np.tile(roles, (n_sims, 1, 1))
+    role_minimums = np.array([ROLE_MINIMUMS[role] for role in ROLES] + [0])
+
+    prices = np.full((n_sims, n_players), np.nan)
+    buyers = np.full((n_sims, n_players), -1, dtype=np.int16)
+
+    # Each simulation auctions the pool in its own random order
+    order = rng.permuted(np.tile(np.arange(n_players), (n_sims, 1)), axis=1)
+
+    for step in range(n_players):
+        player = order[:, step]
+
+        # Sample a price bin from predict_proba, then a price inside it
+        u = rng.random(n_sims)
+        cls = (pool.cumulative[player] < u[:, None]).sum(axis=1)
+        low, high = pool.low[cls], pool.high[cls]
+        price = low + (high - low) * rng.random(n_sims)
+        valuations = price[:, None] * rng.lognormal(0.0, VALUATION_SPREAD, (n_sims, n_teams))
+
+        # The most a team can bid while still affording a minimum squad
+        reserve = np.maximum(MIN_SQUAD - squad - 1, 0) * BASE_PRICE_LAKHS
+        max_bid = purse - reserve
+        is_overseas = pool.overseas[player][:, None]
+        # Places left after this player must cover the roles still short
+        short = np.maximum(role_minimums - roles, 0)
+        fills_need = short[sims, :, pool.role[player]] > 0
+        roles_fit = short.sum(axis=2) - fills_need <= MAX_SQUAD - squad - 1
+        eligible = ((squad < MAX_SQUAD) & ~(is_overseas & (overseas >= MAX_OVERSEAS))
+                    & roles_fit & (max_bid >= BASE_PRICE_LAKHS))
+        bids = np.where(eligible, np.minimum(valuations, max_bid), -np.inf)
+
+        # Highest bid wins at the runner-up's bid, never below base price
+        top_two = np.partition(bids, n_teams - 2, axis=1)[:, -2:]
+        winner = bids.argmax(axis=1)
+        best = top_two[:, 1]
+        sold = best >= BASE_PRICE_LAKHS
+        paid = np.clip(top_two[:, 0], BASE_PRICE_LAKHS, None)
+
+        s, t = sims[sold], winner[sold]
+        purse[s, t] -= paid[sold]
+        squad[s, t] += 1
+        overseas[s, t] += pool.overseas[player[sold]]
+        roles[s, t, pool.role[player[sold]]] += 1
+        prices[s, player[sold]] = paid[sold]
+        buyers[s, player[sold]] = t
+
+    return prices, buyers
+
+
+def _run_chunk(args):
+    return simulate_chunk(*args)
+
+
+def simulate_auction(pool, n_sims=10000, seed=None, teams=None, workers=None, chunk_size=CHUNK_SIZE):
+    """Run n_sims auctions of pool across a process pool and summarise them"""
+    names, purse, squad, overseas, roles = _teams(teams)
+    sizes = [min(chunk_size, n_sims - start) for start in range(0, n_sims, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(pool, purse, squad, overseas, roles, size, child) for size, child in zip(sizes, seeds)]
+
+    if workers == 1 or len(tasks) == 1:
+        results = [_run_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            results = list(executor.map(_run_chunk, tasks))
+
+    prices = np.vstack([chunk_prices for chunk_prices, _ in results])
+    buyers = np.vstack([chunk_buyers for _, chunk_buyers in results])
+    return summarise(pool, names, purse, prices, buyers)
+
+
+def _quantiles(values, qs=(5, 50, 95)):
+    return dict(zip([f'p{q}' for q in qs], np.round(np.percentile(values, qs), 2).tolist()))
+
+
+def summarise(pool, names, purse, prices, buyers):
+    """Per-team spend distributions and per-player price/sale statistics"""
+    n_sims = len(prices)
+    paid = np.nan_to_num(prices)
+
+    teams = []
+    for t, name in enumerate(names):
+        mine = buyers == t
+        spend = np.where(mine, paid, 0.0).sum(axis=1)
+        teams.append({
+            'team': name,
+            'purse': float(purse[t]),
+            'mean_spend': round(float(spend.mean()), 2),
+            'spend': _quantiles(spend),
+            'mean_players_bought': round(float(mine.sum(axis=1).mean()), 2)
+        })
+
+    sold = ~np.isnan(prices)
+    sale_probability = sold.mean(axis=0)
+    players = []
+    for i, name in enumerate(pool.names):
+        player_prices = prices[sold[:, i], i]
+        players.append({
+            'player_name': name,
+            'overseas': bool(pool.overseas[i]),
+            'predicted_price': float(pool.predicted_price[i]),
+            'sale_probability': round(float(sale_probability[i]), 4),
+            'expected_price': round(float(player_prices.mean()), 2) if len(player_prices) else None,
+            'price': _quantiles(player_prices) if len(player_prices) else None
+        })
+
+    return {
+        'simulations': n_sims,
+        'players_in_pool': len(pool),
+        'teams': teams,
+        'players': players
+    }
+
+
+def print_summary(summary, top=15):
+    print(f"\n{summary['simulations']} auctions of {summary['players_in_pool']} players\n")
+    print(f"{'team':<6} {'mean spend':>11} {'p5':>9} {'p50':>9} {'p95':>9} {'players':>8}")
+    for team in summary['teams']:
+        spend = team['spend']
+        print(f"{team['team']:<6} {team['mean_spend']:>11.1f} {spend['p5']:>9.1f} "
+              f"{spend['p50']:>9.1f} {spend['p95']:>9.1f} {team['mean_players_bought']:>8.1f}")
+
+    players = sorted(summary['players'], key=lambda p: -(p['expected_price'] or 0))
+    print(f"\nTop {top} players by expected price (lakhs)")
+    print(f"{'player':<24} {'model':>8} {'expected':>9} {'p5':>8} {'p95':>8} {'sold':>6}")
+    for player in players[:top]:
+        price = player['price'] or {'p5': float('nan'), 'p95': float('nan')}
+        print(f"{player['player_name'][:24]:<24} {player['predicted_price']:>8.1f} "
+              f"{player['expected_price'] or float('nan'):>9.1f} {price['p5']:>8.1f} "
+              f"{price['p95']:>8.1f} {player['sale_probability']:>6.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo IPL auction simulation")
+    parser.add_argument('--pool', help="CSV of players up for auction")
+    parser.add_argument('--data', default='players_dataset.csv', help="dataset to draw a pool from")
+    parser.add_argument('--players', type=int, default=250, help="pool size drawn from --data")
+    parser.add_argument('--sims', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument('--teams', help="JSON list of {name, purse, squad, overseas, roles}")
+    parser.add_argument('--model-dir', default='model_artifacts')
+    parser.add_argument('--output', help="write the full summary to this JSON file")
+    args = parser.parse_args()
+
+    predictor = IPLAuctionPredictor()
+    predictor.load_model(args.model_dir)
+
+    if args.pool:
+        df = load_dataset(args.pool)
+    else:
+        df = load_dataset(args.data)
+        rows = np.random.default_rng(args.seed).choice(len(df), size=min(args.players, len(df)), replace=False)
+        df = df.iloc[np.sort(rows)]
+
+    teams = None
+    if args.teams:
+        with open(args.teams) as f:
+            teams = json.load(f)
+
+    pool = PlayerPool(df, predictor)
+    started = time.perf_counter()
+    summary = simulate_auction(pool, n_sims=args.sims, seed=args.seed, teams=teams, workers=args.workers)
+    print(f"Simulated in {time.perf_counter() - started:.1f}s")
+    print_summary(summary)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
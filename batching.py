@@ -0,0 +1,136 @@
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+# Upper bounds of the histogram buckets (powers of two, last one open)
+HISTOGRAM_BOUNDS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value):
+        index = int(np.searchsorted(HISTOGRAM_BOUNDS, value))
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+    def to_dict(self):
+        labels = [str(bound) for bound in HISTOGRAM_BOUNDS] + [f'>{HISTOGRAM_BOUNDS[-1]}']
+        return {
+            'buckets': dict(zip(labels, self.counts)),
+            'count': self.count,
+            'mean': round(self.total / self.count, 2) if self.count else None
+        }
+
+
+class _Request:
+    __slots__ = ('predictor', 'X', 'done', 'result', 'error')
+
+    def __init__(self, predictor, X):
+        self.predictor = predictor
+        self.X = X
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-player predictions into batched scoring
+
+    Callers block in submit() while a worker thread drains the queue: it
+    takes the first waiting row, keeps collecting until max_batch_size rows
+    or max_wait_ms have passed, scores them in one predict_encoded() pass
+    per predictor and hands every caller its own result.
+    """
+
+    def __init__(self, max_batch_size=64, max_wait_ms=0.2, timeout=30.0):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.batch_sizes = _Histogram()
+        self.queue_depths = _Histogram()
+        self.max_queue_depth = 0
+
+    def submit(self, predictor, X):
+        """Score one encoded row (1, n_features) and return its prediction"""
+        self._ensure_worker()
+        request = _Request(predictor, X)
+        self._queue.put(request)
+        if not request.done.wait(self.timeout):
+            raise TimeoutError("Timed out waiting for a batched prediction")
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _ensure_worker(self):
+        # Threads don't survive fork, each worker process starts its own
+        if self._worker_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._worker_pid == os.getpid():
+                return
+            self._worker_pid = os.getpid()
+            thread = threading.Thread(target=self._run, name='predict-batcher', daemon=True)
+            thread.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        depth = self._queue.qsize() + 1
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch, depth
+
+    def _run(self):
+        while True:
+            batch, depth = self._collect()
+            with self._stats_lock:
+                self.batch_sizes.observe(len(batch))
+                self.queue_depths.observe(depth)
+                self.max_queue_depth = max(self.max_queue_depth, depth)
+
+            # Requests that straddle a model swap are scored by their own model
+            groups = {}
+            for request in batch:
+                groups.setdefault(id(request.predictor), []).append(request)
+
+            for requests in groups.values():
+                try:
+                    X = np.vstack([request.X for request in requests])
+                    results = requests[0].predictor.predict_encoded(X)
+                    for request, result in zip(requests, results):
+                        request.result = result
+                except Exception as e:
+                    for request in requests:
+                        request.error = e
+                for request in requests:
+                    request.done.set()
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000.0,
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'batch_size_histogram': self.batch_sizes.to_dict(),
+                'queue_depth_histogram': self.queue_depths.to_dict()
+            }
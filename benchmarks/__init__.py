@@ -0,0 +1,7 @@
+"""Benchmarks for inference, batch throughput, training and startup
+
+Run from the project root:
+    python -m benchmarks [--only predict,batch] [--output results.json]
+                         [--baseline benchmarks/baseline.json] [--threshold 0.1]
+                         [--save-baseline] [--train-sizes 10000 100000 1000000]
+"""
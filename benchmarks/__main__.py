@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from benchmarks.compare import compare, format_rows
+from benchmarks.suite import BENCHMARKS
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Run the benchmark suite")
+    parser.add_argument('--only', help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--output', help="write results JSON here")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the baseline")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="relative slowdown that counts as a regression (default 0.1)")
+    parser.add_argument('--train-sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    # Old-sklearn pickles and similar noise would drown the report
+    warnings.simplefilter('ignore')
+
+    results = {}
+    for name in names:
+        print(f"Running {name}...", flush=True)
+        started = time.perf_counter()
+        if name == 'train':
+            results[name] = BENCHMARKS[name](sizes=args.train_sizes)
+        else:
+            results[name] = BENCHMARKS[name]()
+        print(f"  {json.dumps(results[name])} ({time.perf_counter() - started:.1f}s)")
+
+    run = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(run, f, indent=2)
+
+    regressed = False
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline['results'], args.threshold)
+        print(f"\nCompared with baseline from {baseline['meta'].get('timestamp')} "
+              f"(commit {baseline['meta'].get('commit')}), threshold {args.threshold:.0%}:")
+        print(format_rows(rows))
+        regressed = any(row[-1] for row in rows)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Compare a benchmark run against a stored baseline"""
+
+COST_SUFFIXES = ('_us', '_ms', '_s', '_mb')
+THROUGHPUT_SUFFIXES = ('_per_s',)
+
+
+def direction(metric):
+    """+1 if higher is better, -1 if lower is better, 0 if unknown"""
+    if metric.endswith(THROUGHPUT_SUFFIXES):
+        return 1
+    if metric.endswith(COST_SUFFIXES):
+        return -1
+    return 0
+
+
+def compare(results, baseline, threshold=0.1):
+    """Rows of (benchmark, metric, baseline, current, change, regressed)
+
+    change is the relative difference, signed so that positive is always
+    an improvement. A metric regresses when it is more than threshold
+    worse than the baseline.
+    """
+    rows = []
+    for bench, metrics in results.items():
+        for metric, current in metrics.items():
+            previous = baseline.get(bench, {}).get(metric)
+            sign = direction(metric)
+            if previous is None or current is None or not previous or sign == 0:
+                rows.append((bench, metric, previous, current, None, False))
+                continue
+            change = sign * (current - previous) / abs(previous)
+            rows.append((bench, metric, previous, current, change, change < -threshold))
+    return rows
+
+
+def format_rows(rows):
+    lines = [f"{'benchmark':<11} {'metric':<32} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for bench, metric, previous, current, change, regressed in rows:
+        previous = '-' if previous is None else f'{previous:g}'
+        current = '-' if current is None else f'{current:g}'
+        change = '' if change is None else f'{change:+.1%}'
+        flag = '  REGRESSION' if regressed else ''
+        lines.append(f'{bench:<11} {metric:<32} {previous:>12} {current:>12} {change:>8}{flag}')
+    return '\n'.join(lines)
@@ -0,0 +1,182 @@
+"""The individual benchmarks
+
+Each benchmark returns a flat dict of metrics. The unit suffix of a
+metric name tells compare.py which direction is better: ``_us``, ``_ms``,
+``_s`` and ``_mb`` are costs, ``_per_s`` is throughput.
+"""
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+MODEL_DIR = 'model_artifacts'
+
+# Trains in a fresh interpreter so peak RSS belongs to this run alone
+TRAIN_CHILD = '''
+import contextlib, io, json, sys, time
+try:
+    import resource
+except ImportError:
+    resource = None
+from model import IPLAuctionPredictor
+
+def rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == 'darwin' else rss / 1024
+
+predictor = IPLAuctionPredictor()
+started = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    predictor.train(sys.argv[1])
+print(json.dumps({'seconds': time.perf_counter() - started, 'peak_rss_mb': rss_mb()}))
+'''
+
+IMPORT_CHILD = '''
+import contextlib, io, json, time
+started = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import app
+print(json.dumps({'seconds': time.perf_counter() - started}))
+'''
+
+
+def _percentiles(samples, scale, unit):
+    samples = np.asarray(samples) * scale
+    return {
+        f'p50_{unit}': round(float(np.percentile(samples, 50)), 3),
+        f'p99_{unit}': round(float(np.percentile(samples, 99)), 3),
+        f'mean_{unit}': round(float(samples.mean()), 3)
+    }
+
+
+def _players(n, seed=0):
+    from synthetic import generate_players, to_records
+    return to_records(generate_players(n, np.random.default_rng(seed)))
+
+
+def _predictor():
+    from model import IPLAuctionPredictor
+    predictor = IPLAuctionPredictor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load_model(MODEL_DIR)
+    return predictor
+
+
+def _child(code, *args):
+    result = subprocess.run([sys.executable, '-c', code, *args], capture_output=True, text=True,
+                            cwd=os.getcwd(), env={**os.environ, 'PYTHONWARNINGS': 'ignore'})
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else 'child failed')
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench_predict(n=2000, warmup=200):
+    """Single-call predict() latency on distinct players, cache off"""
+    predictor = _predictor()
+    players = _players(n + warmup)
+    for player in players[:warmup]:
+        predictor.predict(player)
+
+    timings = []
+    for player in players[warmup:]:
+        started = time.perf_counter()
+        predictor.predict(player)
+        timings.append(time.perf_counter() - started)
+    return _percentiles(timings, 1e6, 'us')
+
+
+def bench_batch(sizes=(1, 10, 100, 1000, 10000), min_seconds=0.5):
+    """predict_batch() throughput at several batch sizes"""
+    predictor = _predictor()
+    players = _players(max(sizes))
+    results = {}
+    for size in sizes:
+        batch = players[:size]
+        predictor.predict_batch(batch)
+        rows = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < min_seconds:
+            predictor.predict_batch(batch)
+            rows += size
+        results[f'batch_{size}_rows_per_s'] = round(rows / (time.perf_counter() - started), 1)
+    return results
+
+
+def bench_train(sizes=(10000, 100000, 1000000)):
+    """train() wall time and peak RSS on synthetic datasets"""
+    from synthetic import write_csv
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f'players_{size}.csv')
+            write_csv(path, size, seed=size, with_price=True)
+            run = _child(TRAIN_CHILD, path)
+            results[f'train_{size}_s'] = round(run['seconds'], 3)
+            if run['peak_rss_mb'] is not None:
+                results[f'train_{size}_peak_rss_mb'] = round(run['peak_rss_mb'], 1)
+    return results
+
+
+def bench_load_model(repeats=50):
+    """load_model() time for the saved artifacts"""
+    from model import IPLAuctionPredictor
+    timings = []
+    for _ in range(repeats):
+        predictor = IPLAuctionPredictor()
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            predictor.load_model(MODEL_DIR)
+            timings.append(time.perf_counter() - started)
+    return _percentiles(timings, 1e3, 'ms')
+
+
+def bench_import(repeats=3):
+    """Cold `import app` in a fresh interpreter"""
+    timings = [_child(IMPORT_CHILD)['seconds'] for _ in range(repeats)]
+    return {'import_app_median_s': round(float(np.median(timings)), 3)}
+
+
+def bench_flask(n=2000):
+    """End-to-end /api/predict and /api/health through the test client"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    client = app.app.test_client()
+    players = _players(n, seed=1)
+
+    results = {}
+    for name, send in (
+        ('predict', lambda i: client.post('/api/predict', json=players[i])),
+        ('health', lambda i: client.get('/api/health'))
+    ):
+        send(0)
+        timings = []
+        started = time.perf_counter()
+        for i in range(n):
+            t = time.perf_counter()
+            response = send(i)
+            timings.append(time.perf_counter() - t)
+            if response.status_code != 200:
+                raise RuntimeError(f'{name} returned {response.status_code}')
+        elapsed = time.perf_counter() - started
+        results[f'{name}_requests_per_s'] = round(n / elapsed, 1)
+        results.update({f'{name}_{key}': value for key, value in _percentiles(timings, 1e6, 'us').items()})
+    return results
+
+
+BENCHMARKS = {
+    'predict': bench_predict,
+    'batch': bench_batch,
+    'train': bench_train,
+    'load_model': bench_load_model,
+    'import': bench_import,
+    'flask': bench_flask
+}
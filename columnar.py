@@ -0,0 +1,158 @@
+"""Typed, memory-mappable columnar cache of a CSV dataset
+
+The first load of ``players_dataset.csv`` writes every column as its own
+``.npy`` file under ``players_dataset.columns/<mtime>-<size>/``:
+numeric columns are downcast where that is lossless and text columns
+(role, country, batting/bowling style, ...) are stored as integer codes
+with their vocabulary in ``manifest.json``. Later loads mmap those files
+instead of re-parsing the CSV, so gunicorn workers share the pages, and a
+changed CSV gets a fresh directory automatically.
+
+Usage:
+    python columnar.py players_dataset.csv
+"""
+import json
+import os
+import shutil
+import sys
+import threading
+
+import numpy as np
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 1
+
+
+def columnar_cache_dir(csv_path):
+    """Directory holding the columnar versions of csv_path"""
+    return os.path.splitext(csv_path)[0] + '.columns'
+
+
+def _source_version(csv_path):
+    stat = os.stat(csv_path)
+    return f'{stat.st_mtime_ns}-{stat.st_size}'
+
+
+def _compact_numeric(column):
+    """Smallest dtype that holds the column without changing any value"""
+    import pandas as pd
+
+    values = column.to_numpy()
+    if values.dtype.kind in 'iu':
+        return pd.to_numeric(column, downcast='integer').to_numpy()
+    if values.dtype.kind == 'f':
+        as_float32 = values.astype(np.float32)
+        if np.array_equal(as_float32.astype(values.dtype), values, equal_nan=True):
+            return as_float32
+    if values.dtype.kind == 'b':
+        return values.astype(np.bool_)
+    return values
+
+
+def _code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def build_columnar_cache(csv_path):
+    """Convert csv_path into a versioned directory of .npy columns"""
+    version = _source_version(csv_path)
+    cache_dir = columnar_cache_dir(csv_path)
+    target = os.path.join(cache_dir, version)
+    if os.path.exists(os.path.join(target, MANIFEST)):
+        return target
+
+    # pandas only loads for the few callers that need the dataset
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+
+    # Write into a private directory and rename it into place, so readers
+    # never see a half-written version
+    tmp = f'{target}.tmp-{os.getpid()}-{threading.get_ident()}'
+    os.makedirs(tmp, exist_ok=True)
+    columns = []
+    try:
+        for i, name in enumerate(df.columns):
+            column = df[name]
+            entry = {'name': name, 'file': f'{i:03d}.npy'}
+            if column.dtype == object:
+                codes, categories = pd.factorize(column, sort=True)
+                np.save(os.path.join(tmp, entry['file']), codes.astype(_code_dtype(len(categories))))
+                entry['kind'] = 'category'
+                entry['categories'] = [str(c) for c in categories]
+            else:
+                np.save(os.path.join(tmp, entry['file']), _compact_numeric(column))
+                entry['kind'] = 'numeric'
+            columns.append(entry)
+
+        with open(os.path.join(tmp, MANIFEST), 'w') as f:
+            json.dump({
+                'format_version': FORMAT_VERSION,
+                'source': os.path.basename(csv_path),
+                'source_version': version,
+                'rows': len(df),
+                'columns': columns
+            }, f)
+
+        try:
+            os.rename(tmp, target)
+        except OSError:
+            # Another process finished the same version first
+            if not os.path.exists(os.path.join(target, MANIFEST)):
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    # Drop versions built from older copies of the CSV
+    for entry in os.listdir(cache_dir):
+        if entry != version and '.tmp-' not in entry:
+            shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+
+    return target
+
+
+def read_columnar(directory):
+    """Load a columnar directory as a DataFrame backed by read-only mmaps"""
+    import pandas as pd
+
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format in {directory}")
+
+    data = {}
+    for entry in manifest['columns']:
+        values = np.load(os.path.join(directory, entry['file']), mmap_mode='r')
+        if entry['kind'] == 'category':
+            values = pd.Categorical.from_codes(values, categories=entry['categories'])
+        data[entry['name']] = values
+
+    return pd.DataFrame(data, copy=False)
+
+
+def load_dataset(csv_path):
+    """Load csv_path through its columnar cache, rebuilding it if stale
+
+    Falls back to parsing the CSV when the cache can't be written.
+    """
+    try:
+        directory = build_columnar_cache(csv_path)
+    except OSError as e:
+        if not os.path.exists(csv_path):
+            raise
+        print(f"Columnar cache unavailable ({e}), reading {csv_path} directly")
+        import pandas as pd
+        return pd.read_csv(csv_path)
+    return read_columnar(directory)
+
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else 'players_dataset.csv'
+    directory = build_columnar_cache(csv_path)
+    df = read_columnar(directory)
+    print(f"Columnar cache for {csv_path}: {directory}")
+    print(f"Rows: {len(df)}, columns: {len(df.columns)}")
+    print(df.dtypes.to_string())
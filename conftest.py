@@ -0,0 +1 @@
+# Keeps the repo root importable from tests/
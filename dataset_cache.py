@@ -0,0 +1,78 @@
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+from columnar import load_dataset
+
+
+class DatasetSnapshot:
+    """One parsed version of the dataset with its aggregates precomputed"""
+
+    def __init__(self, df, signature):
+        import pandas as pd
+
+        self.df = df
+        self.signature = signature
+        self.etag = hashlib.sha1(repr(signature).encode()).hexdigest()
+
+        # Columns may be stored downcast, aggregate in float64
+        prices = df['auction_price_lakhs'].astype(np.float64)
+        self.stats = {
+            'total_players': len(df),
+            'avg_price': round(float(prices.mean()), 2),
+            'max_price': round(float(prices.max()), 2),
+            'min_price': round(float(prices.min()), 2),
+            'role_distribution': df['role'].value_counts().to_dict(),
+            'country_distribution': df['country'].value_counts().to_dict(),
+            'avg_age': round(float(df['age'].astype(np.float64).mean()), 2),
+            'total_runs': int(df['runs_scored'].sum()),
+            'total_wickets': int(df['wickets_taken'].sum())
+        }
+
+        # Row positions per role, in order of first appearance like unique()
+        codes, roles = pd.factorize(df['role'])
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(roles) + 1))
+        self.role_rows = {
+            role: order[bounds[i]:bounds[i + 1]]
+            for i, role in enumerate(roles)
+        }
+
+    def sample_by_role(self, per_role=2, rng=None):
+        """Sample up to per_role rows of every role"""
+        rng = rng or np.random.default_rng()
+        picks = [
+            rng.choice(rows, size=min(per_role, len(rows)), replace=False)
+            for rows in self.role_rows.values()
+        ]
+        return self.df.iloc[np.concatenate(picks)] if picks else self.df.iloc[:0]
+
+
+class DatasetCache:
+    """Parse the dataset once and reload only when its mtime or size changes"""
+
+    def __init__(self, path):
+        self.path = path
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def _signature(self):
+        stat = os.stat(self.path)
+        return (os.path.abspath(self.path), stat.st_mtime_ns, stat.st_size)
+
+    def get(self):
+        """Current snapshot, re-parsing the file if it changed on disk"""
+        signature = self._signature()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.signature == signature:
+            return snapshot
+
+        with self._lock:
+            # Another thread may have reloaded while we waited
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.signature != signature:
+                snapshot = DatasetSnapshot(load_dataset(self.path), signature)
+                self._snapshot = snapshot
+        return snapshot
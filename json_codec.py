@@ -0,0 +1,57 @@
+"""Faster JSON for request bodies and responses when orjson is installed
+
+orjson parses and serialises several times faster than the standard
+library and handles NumPy scalars and arrays directly. It is optional:
+without it the app keeps Flask's default provider and json.dumps.
+"""
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj):
+    """Compact JSON text, e.g. one NDJSON line"""
+    if orjson is None:
+        return json.dumps(obj)
+    return orjson.dumps(obj, default=DefaultJSONProvider.default, option=_OPTIONS).decode()
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson
+
+    Output matches the default provider (sorted keys, same fallbacks for
+    dates, decimals and dataclasses), except that NaN and infinity are
+    written as null. jsonify's compact separators and debug-mode indent=2
+    map onto orjson; any other json.dumps/loads keyword arguments go to
+    the default implementation.
+    """
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop('indent', None)
+        separators = kwargs.pop('separators', None)
+        if kwargs or indent not in (None, 2) or separators not in (None, (',', ':')):
+            return super().dumps(obj, indent=indent, separators=separators, **kwargs)
+        option = _OPTIONS | orjson.OPT_SORT_KEYS if self.sort_keys else _OPTIONS
+        if indent is not None:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def install(app):
+    """Use orjson for app's request and response JSON if it is available"""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    return orjson is not None
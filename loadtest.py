@@ -0,0 +1,416 @@
+"""Load test the API with a mix of endpoints or a recorded trace
+
+Drives /api/predict, /api/dataset-stats, /api/upload-csv and
+/api/generate-demo-data from several threads, either as fast as they
+answer or at a fixed total rate, against a running server (--url) or the
+app in this process through Flask's test client. Reports throughput,
+p50/p95/p99 latency and error rate per endpoint, as JSON with --output so
+runs can be compared across commits.
+
+With --rate, every request has a scheduled start time and its latency is
+counted from then, so a server that falls behind shows the queueing
+delay instead of quietly being sent fewer requests.
+
+Payloads come from the synthetic generator, or from --players (JSONL,
+one player dict per line). --trace replays recorded requests in order
+instead of the mix, one JSON object per line:
+    {"method": "POST", "path": "/api/predict", "body": {...player...}}
+    {"path": "/api/dataset-stats"}
+    {"path": "/api/upload-csv", "csv": "age,role,...\\n25,Batsman,..."}
+method defaults to POST when there is a body or csv, GET otherwise, and
+"endpoint" can name the request in the report (default: its path).
+
+Usage:
+    python loadtest.py --duration 30 --concurrency 8
+    python loadtest.py --url http://127.0.0.1:5000 --rate 200 --output run.json
+    python loadtest.py --mix predict=90,stats=10 --players players.jsonl
+    python loadtest.py --url http://127.0.0.1:5000 --trace traffic.jsonl --requests 5000
+"""
+import argparse
+import contextlib
+import csv
+import http.client
+import io
+import json
+import subprocess
+import threading
+import time
+import uuid
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+DEFAULT_MIX = 'predict=70,stats=15,demo=10,upload=5'
+UPLOAD_ROWS = 20
+PAYLOAD_POOL = 1000
+
+
+class LoadRequest:
+    """One request to send, reusable across sends"""
+
+    def __init__(self, endpoint, method, path, body=None, csv_text=None):
+        self.endpoint = endpoint
+        self.method = method
+        self.path = path
+        self.body = body
+        self.csv_text = csv_text
+
+    @classmethod
+    def from_trace(cls, record):
+        if not isinstance(record, dict) or 'path' not in record:
+            raise ValueError(f"Trace lines need a 'path': {record!r}")
+        body = record.get('body')
+        csv_text = record.get('csv')
+        method = record.get('method') or ('POST' if body is not None or csv_text is not None else 'GET')
+        endpoint = record.get('endpoint') or record['path'].split('?', 1)[0]
+        return cls(endpoint, method.upper(), record['path'], body, csv_text)
+
+
+def _csv_text(players):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=['player_name', *players[0]])
+    writer.writeheader()
+    for i, player in enumerate(players, 1):
+        writer.writerow({'player_name': f'Player {i}', **player})
+    return out.getvalue()
+
+
+def build_pool(players, seed=0):
+    """Ready-made requests per mix endpoint, built once before the run"""
+    rng = np.random.default_rng(seed)
+    uploads = []
+    for _ in range(max(1, min(50, len(players) // UPLOAD_ROWS))):
+        rows = rng.choice(len(players), size=min(UPLOAD_ROWS, len(players)), replace=False)
+        uploads.append(_csv_text([players[i] for i in rows]))
+    return {
+        'predict': [LoadRequest('predict', 'POST', '/api/predict', body=player) for player in players],
+        'stats': [LoadRequest('stats', 'GET', '/api/dataset-stats')],
+        'demo': [
+            LoadRequest('demo', 'GET', '/api/generate-demo-data?' + urlencode({'n': 10, 'seed': seed}))
+            for seed in range(100)
+        ],
+        'upload': [LoadRequest('upload', 'POST', '/api/upload-csv', csv_text=text) for text in uploads]
+    }
+
+
+def parse_mix(text, endpoints):
+    """'predict=70,stats=30' -> (names, probabilities)"""
+    weights = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in endpoints:
+            raise ValueError(f"Unknown endpoint in mix: {name!r} (choose from {', '.join(endpoints)})")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Mix weights must add up to more than 0")
+    names = list(weights)
+    return names, np.array([weights[name] for name in names]) / total
+
+
+def _multipart(csv_text):
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\n'
+        'Content-Disposition: form-data; name="file"; filename="players.csv"\r\n'
+        'Content-Type: text/csv\r\n\r\n'
+        f'{csv_text}\r\n'
+        f'--{boundary}--\r\n'
+    ).encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+class TestClientTarget:
+    """The app in this process, through one Flask test client per thread"""
+
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self._local = threading.local()
+
+    def send(self, req):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        if req.csv_text is not None:
+            data = {'file': (io.BytesIO(req.csv_text.encode()), 'players.csv')}
+            response = client.open(req.path, method=req.method, data=data, content_type='multipart/form-data')
+        else:
+            response = client.open(req.path, method=req.method, json=req.body)
+        # Streamed responses (NDJSON) only finish once read to the end
+        response.get_data()
+        status = response.status_code
+        response.close()
+        return status
+
+    def describe(self):
+        return 'test-client'
+
+
+class HttpTarget:
+    """A running server, one keep-alive connection per thread"""
+
+    def __init__(self, url, timeout=30.0):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"URL must start with http:// or https://: {url}")
+        self.url = url.rstrip('/')
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+            conn = self._local.conn = cls(self.netloc, timeout=self.timeout)
+        return conn
+
+    def send(self, req):
+        if req.csv_text is not None:
+            body, content_type = _multipart(req.csv_text)
+        elif req.body is not None:
+            body, content_type = json.dumps(req.body).encode(), 'application/json'
+        else:
+            body, content_type = None, None
+        headers = {'Content-Type': content_type} if content_type else {}
+
+        conn = self._connection()
+        try:
+            conn.request(req.method, self.prefix + req.path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            # Start over on a fresh connection next time
+            conn.close()
+            self._local.conn = None
+            raise
+        if response.will_close:
+            conn.close()
+            self._local.conn = None
+        return response.status
+
+    def describe(self):
+        return self.url
+
+
+class LoadRun:
+    """Sends requests from `concurrency` threads and keeps every outcome"""
+
+    def __init__(self, target, next_request, concurrency=4, rate=None, duration=10.0, requests=None):
+        self.target = target
+        self.next_request = next_request
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.requests = requests
+        self._issued = 0
+        self._lock = threading.Lock()
+
+    def _claim(self):
+        """Index of the next request to send, or None when the run is over"""
+        with self._lock:
+            i = self._issued
+            if self.requests is not None and i >= self.requests:
+                return None
+            self._issued += 1
+            return i
+
+    def _worker(self, worker_id, started, deadline, samples):
+        rng = np.random.default_rng(worker_id)
+        while True:
+            i = self._claim()
+            if i is None:
+                return
+            if self.rate:
+                scheduled = started + i / self.rate
+                if scheduled >= deadline:
+                    return
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                scheduled = time.perf_counter()
+                if scheduled >= deadline:
+                    return
+            req = self.next_request(i, rng)
+            try:
+                status = self.target.send(req)
+            except Exception as e:
+                status = type(e).__name__
+            samples.append((req.endpoint, time.perf_counter() - scheduled, status))
+
+    def run(self):
+        """Returns (samples, elapsed seconds); samples are (endpoint, latency, status)"""
+        per_thread = [[] for _ in range(self.concurrency)]
+        started = time.perf_counter()
+        # Without a duration only the request count ends the run
+        deadline = started + self.duration if self.duration else float('inf')
+        threads = [
+            threading.Thread(target=self._worker, args=(k, started, deadline, per_thread[k]), daemon=True)
+            for k in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        return [sample for samples in per_thread for sample in samples], elapsed
+
+
+def _is_error(status):
+    return not isinstance(status, int) or status >= 400
+
+
+def _summarize(latencies, statuses, elapsed):
+    latencies = np.asarray(latencies) * 1000
+    errors = sum(_is_error(status) for status in statuses)
+    counts = {}
+    for status in statuses:
+        counts[str(status)] = counts.get(str(status), 0) + 1
+    return {
+        'requests': len(statuses),
+        'errors': errors,
+        'error_rate': round(errors / len(statuses), 4) if statuses else 0.0,
+        'throughput_per_s': round(len(statuses) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3) if len(latencies) else None,
+        'p95_ms': round(float(np.percentile(latencies, 95)), 3) if len(latencies) else None,
+        'p99_ms': round(float(np.percentile(latencies, 99)), 3) if len(latencies) else None,
+        'mean_ms': round(float(latencies.mean()), 3) if len(latencies) else None,
+        'max_ms': round(float(latencies.max()), 3) if len(latencies) else None,
+        'statuses': dict(sorted(counts.items()))
+    }
+
+
+def report(samples, elapsed):
+    """Overall and per-endpoint summaries of a run"""
+    by_endpoint = {}
+    for endpoint, latency, status in samples:
+        latencies, statuses = by_endpoint.setdefault(endpoint, ([], []))
+        latencies.append(latency)
+        statuses.append(status)
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'total': _summarize([s[1] for s in samples], [s[2] for s in samples], elapsed),
+        'endpoints': {
+            endpoint: _summarize(latencies, statuses, elapsed)
+            for endpoint, (latencies, statuses) in sorted(by_endpoint.items())
+        }
+    }
+
+
+def format_report(result):
+    lines = [f"{'endpoint':<24} {'reqs':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"]
+    rows = [*result['endpoints'].items(), ('TOTAL', result['total'])]
+    for name, row in rows:
+        p50, p95, p99 = (f"{row[key]:.2f}" if row[key] is not None else '-' for key in ('p50_ms', 'p95_ms', 'p99_ms'))
+        lines.append(f"{name:<24} {row['requests']:>7} {row['throughput_per_s']:>8.1f} "
+                     f"{p50:>8} {p95:>8} {p99:>8} {row['error_rate']:>7.2%}")
+    return '\n'.join(lines)
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API with an endpoint mix or a recorded trace")
+    parser.add_argument('--url', help="running server, e.g. http://127.0.0.1:5000 (default: in-process test client)")
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f"endpoint=weight pairs from predict, stats, demo, upload (default {DEFAULT_MIX})")
+    parser.add_argument('--trace', help="JSONL of recorded requests to replay in order instead of the mix")
+    parser.add_argument('--players', help="JSONL of player payloads (default: synthetic players)")
+    parser.add_argument('--concurrency', type=int, default=4, help="sending threads")
+    parser.add_argument('--rate', type=float, help="total requests per second (default: as fast as possible)")
+    parser.add_argument('--duration', type=float, default=None, help="seconds to run (default 10)")
+    parser.add_argument('--requests', type=int, help="stop after this many requests")
+    parser.add_argument('--warmup', type=int, default=20, help="unrecorded requests sent first")
+    parser.add_argument('--timeout', type=float, default=30.0, help="per-request timeout for --url")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the results JSON here")
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+    duration = args.duration if args.duration is not None else (None if args.requests else 10.0)
+
+    if args.trace:
+        trace = [LoadRequest.from_trace(record) for record in read_jsonl(args.trace)]
+        if not trace:
+            parser.error(f"{args.trace} has no requests")
+        next_request = lambda i, rng: trace[i % len(trace)]
+        workload = {'trace': args.trace, 'trace_requests': len(trace)}
+    else:
+        if args.players:
+            players = read_jsonl(args.players)
+        else:
+            from synthetic import generate_players, to_records
+            players = to_records(generate_players(PAYLOAD_POOL, np.random.default_rng(args.seed)))
+        if not players:
+            parser.error("no player payloads")
+        pool = build_pool(players, args.seed)
+        try:
+            names, probabilities = parse_mix(args.mix, pool)
+        except ValueError as e:
+            parser.error(str(e))
+
+        def next_request(i, rng):
+            requests = pool[names[rng.choice(len(names), p=probabilities)]]
+            return requests[rng.integers(len(requests))]
+        workload = {'mix': dict(zip(names, probabilities.round(4).tolist())),
+                    'players': args.players or 'synthetic'}
+
+    if args.url:
+        target = HttpTarget(args.url, args.timeout)
+    else:
+        # The app's startup report and model messages would bury the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            import app
+            app.warm_caches()
+        target = TestClientTarget(app.app)
+
+    if args.warmup:
+        LoadRun(target, next_request, args.concurrency, duration=0, requests=args.warmup).run()
+
+    print(f"Load testing {target.describe()}: {args.concurrency} threads, "
+          f"{f'{args.rate:g} req/s' if args.rate else 'unthrottled'}, "
+          f"{f'{duration:g}s' if duration else f'{args.requests} requests'}", flush=True)
+    samples, elapsed = LoadRun(target, next_request, args.concurrency, args.rate, duration, args.requests).run()
+    result = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': _git_commit(),
+            'target': target.describe(),
+            'concurrency': args.concurrency,
+            'rate': args.rate,
+            'duration_s': duration,
+            'requests': args.requests,
+            'seed': args.seed,
+            **workload
+        },
+        **report(samples, elapsed)
+    }
+    print(format_report(result))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
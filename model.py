@@ -1,24 +1,168 @@
-import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.naive_bayes import GaussianNB
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.metrics import mean_absolute_error, r2_score, mean_squared_error
+from datetime import datetime, timezone
+import argparse
+import hashlib
 import pickle
 import os
+import time
+
+from columnar import load_dataset
+from model_bundle import write_bundle, read_bundle
+from nb_kernel import FusedGaussianNB
+from quantile_sketch import QuantileSketch
+from schema import PlayerSchema
+
+BUNDLE_FILE = 'model.bundle'
+
+# Artifacts written by versions before the single-file bundle
+LEGACY_PICKLES = ['naive_bayes_model', 'scaler', 'label_encoders', 'price_bins', 'feature_columns']
+
+# Categorical columns to encode
+CATEGORICAL_COLUMNS = ['role', 'country', 'batting_style', 'bowling_style']
+
+# Model features, in training order
+FEATURE_COLUMNS = [
+    'age', 'role', 'country', 'batting_style', 'bowling_style',
+    'domestic_matches', 'innings_batted', 'runs_scored', 
+    'batting_average', 'batting_strike_rate', 'hundreds', 'fifties',
+    'highest_score', 'boundary_percentage', 'overs_bowled', 
+    'wickets_taken', 'bowling_average', 'economy_rate',
+    'bowling_strike_rate', 'five_wicket_hauls', 'best_bowling_wickets',
+    'dot_ball_percentage', 'catches', 'stumpings',
+    'consistency_rating', 'fitness_score', 'experience_factor',
+    'recent_form_rating', 'match_winning_performances', 
+    'pressure_handling_score'
+]
+
+TARGET_COLUMN = 'auction_price_lakhs'
+
 
 class IPLAuctionPredictor:
-    def __init__(self):
-        self.model = GaussianNB()
-        self.scaler = StandardScaler()
-        self.label_encoders = {}
+    """Naive Bayes price-bin classifier
+
+    Scoring only needs NumPy. pandas and scikit-learn are imported the
+    first time training, CSV encoding or the sklearn estimators
+    (``model``, ``scaler``, ``label_encoders``) are actually used, so a
+    server that only predicts from a saved bundle never loads them.
+    """
+    
+    def __init__(self, kernel_dtype='float64'):
+        # sklearn estimators, created on first access (see _build_estimators)
+        self._model = None
+        self._scaler = None
+        self._label_encoders = None
+        # (arrays, header) of a loaded bundle until estimators are built from it
+        self._bundle = None
         self.feature_columns = []
         self.price_bins = []
         self.is_trained = False
+        self.model_version = None
+        self.model_created_at = None
+        # Optional PredictionCache consulted by predict()
+        self.prediction_cache = None
+        # Optional MicroBatcher that coalesces concurrent predict() calls
+        self.batcher = None
+        # Optional histogram with observe(seconds, stage) for stage timings
+        self.stage_timer = None
+        # float32 trades a little precision for higher batch throughput
+        self.kernel_dtype = np.dtype(kernel_dtype)
+    
+    @property
+    def model(self):
+        if self._model is None:
+            self._build_estimators()
+        return self._model
+    
+    @model.setter
+    def model(self, value):
+        self._set_estimator('_model', value)
+    
+    @property
+    def scaler(self):
+        if self._scaler is None:
+            self._build_estimators()
+        return self._scaler
+    
+    @scaler.setter
+    def scaler(self, value):
+        self._set_estimator('_scaler', value)
+    
+    @property
+    def label_encoders(self):
+        if self._label_encoders is None:
+            self._build_estimators()
+        return self._label_encoders
+    
+    @label_encoders.setter
+    def label_encoders(self, value):
+        self._set_estimator('_label_encoders', value)
+    
+    def _set_estimator(self, attr, value):
+        # Replacing one estimator of a loaded bundle keeps the other two
+        if self._bundle is not None:
+            self._build_estimators()
+        setattr(self, attr, value)
+    
+    def _build_estimators(self):
+        """Create the sklearn estimators, fitted from the loaded bundle if any"""
+        from sklearn.naive_bayes import GaussianNB
+        from sklearn.preprocessing import LabelEncoder, StandardScaler
         
-    def create_price_bins(self, prices, n_bins=20):
-        """Create price bins for classification"""
-        self.price_bins = np.percentile(prices, np.linspace(0, 100, n_bins + 1))
+        if self._bundle is None:
+            model, scaler, label_encoders = GaussianNB(), StandardScaler(), {}
+        else:
+            arrays, header = self._bundle
+            feature_columns = header['feature_columns']
+            
+            # Copies keep the estimators writable (partial_fit updates in place)
+            model = GaussianNB(var_smoothing=header['var_smoothing'])
+            model.classes_ = np.array(arrays['classes'])
+            model.class_count_ = np.array(arrays['class_count'])
+            model.class_prior_ = np.array(arrays['class_prior'])
+            model.theta_ = np.array(arrays['theta'])
+            model.var_ = np.array(arrays['var'])
+            model.epsilon_ = header['epsilon']
+            model.n_features_in_ = len(feature_columns)
+            
+            scaler = StandardScaler()
+            scaler.mean_ = np.array(arrays['scaler_mean'])
+            scaler.var_ = np.array(arrays['scaler_var'])
+            scaler.scale_ = np.array(arrays['scaler_scale'])
+            scaler.n_samples_seen_ = header['scaler_n_samples_seen']
+            scaler.n_features_in_ = len(feature_columns)
+            scaler.feature_names_in_ = np.array(feature_columns, dtype=object)
+            
+            label_encoders = {}
+            for col, labels in header['categories'].items():
+                label_encoders[col] = LabelEncoder()
+                label_encoders[col].classes_ = np.array(labels, dtype=object)
+            self._bundle = None
+        
+        # Anything assigned explicitly before this call wins
+        if self._model is None:
+            self._model = model
+        if self._scaler is None:
+            self._scaler = scaler
+        if self._label_encoders is None:
+            self._label_encoders = label_encoders
+    
+    def _vocabularies(self):
+        """Category labels per encoded column, without building the encoders"""
+        if self._bundle is not None:
+            return self._bundle[1]['categories']
+        return {col: encoder.classes_ for col, encoder in self.label_encoders.items()}
+    
+    def create_price_bins(self, prices, n_bins=20, strategy='percentile'):
+        """Create price bins for classification
+
+        'percentile' gives equal-count bins, 'uniform' equal-width ones.
+        """
+        if strategy == 'percentile':
+            self.price_bins = np.percentile(prices, np.linspace(0, 100, n_bins + 1))
+        elif strategy == 'uniform':
+            self.price_bins = np.linspace(np.min(prices), np.max(prices), n_bins + 1)
+        else:
+            raise ValueError(f"Unknown binning strategy: {strategy}")
         return np.digitize(prices, self.price_bins[1:-1])
     
     def price_from_bin(self, bin_idx):
@@ -30,12 +174,11 @@ class IPLAuctionPredictor:
     
     def preprocess_data(self, df, fit=False):
         """Preprocess the dataset"""
-        df = df.copy()
+        from sklearn.preprocessing import LabelEncoder
         
-        # Categorical columns to encode
-        categorical_cols = ['role', 'country', 'batting_style', 'bowling_style']
+        df = df.copy()
         
-        for col in categorical_cols:
+        for col in CATEGORICAL_COLUMNS:
             if col in df.columns:
                 if fit:
                     self.label_encoders[col] = LabelEncoder()
@@ -44,22 +187,8 @@ class IPLAuctionPredictor:
                     if col in self.label_encoders:
                         df[col] = self.label_encoders[col].transform(df[col].astype(str))
         
-        # Select numeric features
-        feature_cols = [
-            'age', 'role', 'country', 'batting_style', 'bowling_style',
-            'domestic_matches', 'innings_batted', 'runs_scored', 
-            'batting_average', 'batting_strike_rate', 'hundreds', 'fifties',
-            'highest_score', 'boundary_percentage', 'overs_bowled', 
-            'wickets_taken', 'bowling_average', 'economy_rate',
-            'bowling_strike_rate', 'five_wicket_hauls', 'best_bowling_wickets',
-            'dot_ball_percentage', 'catches', 'stumpings',
-            'consistency_rating', 'fitness_score', 'experience_factor',
-            'recent_form_rating', 'match_winning_performances', 
-            'pressure_handling_score'
-        ]
-        
         # Filter existing columns
-        self.feature_columns = [col for col in feature_cols if col in df.columns]
+        self.feature_columns = [col for col in FEATURE_COLUMNS if col in df.columns]
         
         X = df[self.feature_columns].fillna(0)
         
@@ -72,8 +201,11 @@ class IPLAuctionPredictor:
     
     def train(self, csv_path):
         """Train the Naive Bayes model"""
+        from sklearn.metrics import mean_absolute_error, r2_score, mean_squared_error
+        from sklearn.model_selection import train_test_split
+        
         print("Loading dataset...")
-        df = pd.read_csv(csv_path)
+        df = load_dataset(csv_path)
         
         print(f"Dataset shape: {df.shape}")
         print(f"Features: {len(self.feature_columns)}")
@@ -82,7 +214,7 @@ class IPLAuctionPredictor:
         X = self.preprocess_data(df, fit=True)
         
         # Create price bins for classification
-        y = self.create_price_bins(df['auction_price_lakhs'].values)
+        y = self.create_price_bins(df[TARGET_COLUMN].values)
         
         print(f"Number of price bins: {len(self.price_bins)}")
         
@@ -111,84 +243,485 @@ class IPLAuctionPredictor:
         print(f"R² Score: {r2:.4f}")
         
         self.is_trained = True
+        self._prepare_inference()
+        return mae, rmse, r2
+    
+    def train_streaming(self, csv_path, chunksize=100000, n_bins=20, test_size=0.2, random_state=42):
+        """Train out-of-core from CSV chunks
+
+        Peak memory depends on chunksize, not on the dataset size. The CSV
+        is streamed four times: category vocabularies and a price quantile
+        sketch, scaler partial_fit, GaussianNB partial_fit on the training
+        rows, then evaluation on the held-out rows.
+        """
+        import pandas as pd
+        from sklearn.naive_bayes import GaussianNB
+        from sklearn.preprocessing import LabelEncoder, StandardScaler
+        
+        print(f"Streaming dataset in chunks of {chunksize} rows...")
+        
+        header = pd.read_csv(csv_path, nrows=0).columns
+        self.feature_columns = [col for col in FEATURE_COLUMNS if col in header]
+        categorical = [col for col in CATEGORICAL_COLUMNS if col in self.feature_columns]
+        usecols = self.feature_columns + [TARGET_COLUMN]
+        
+        def chunks():
+            return pd.read_csv(csv_path, chunksize=chunksize, usecols=usecols)
+        
+        # Pass 1: category vocabularies and price quantiles
+        vocab = {col: set() for col in categorical}
+        sketch = QuantileSketch()
+        n_rows = 0
+        for chunk in chunks():
+            for col in categorical:
+                vocab[col].update(chunk[col].astype(str).unique())
+            sketch.update(chunk[TARGET_COLUMN].values)
+            n_rows += len(chunk)
+        
+        print(f"Dataset rows: {n_rows}")
+        print(f"Features: {len(self.feature_columns)}")
+        
+        self.label_encoders = {}
+        for col in categorical:
+            self.label_encoders[col] = LabelEncoder().fit(np.array(sorted(vocab[col]), dtype=object))
+        self.price_bins = sketch.quantiles(np.linspace(0, 1, n_bins + 1))
+        
+        print(f"Number of price bins: {len(self.price_bins)}")
+        
+        # Pass 2: scaler statistics, and which price bins actually occur
+        self.scaler = StandardScaler()
+        observed = set()
+        for chunk in chunks():
+            X, _ = self._encode_frame(chunk)
+            self.scaler.partial_fit(pd.DataFrame(X, columns=self.feature_columns))
+            observed.update(np.unique(self._price_to_bin(chunk[TARGET_COLUMN].values)).tolist())
+        classes = np.array(sorted(observed))
+        
+        # Pass 3: Naive Bayes on the training split
+        print("Training Naive Bayes model...")
+        self.model = GaussianNB(var_smoothing=self.model.var_smoothing)
+        rng = np.random.default_rng(random_state)
+        for chunk in chunks():
+            X, _ = self._encode_frame(chunk)
+            y = self._price_to_bin(chunk[TARGET_COLUMN].values)
+            train = rng.random(len(chunk)) >= test_size
+            if train.any():
+                self.model.partial_fit(self._scale_rows(X[train]), y[train], classes=classes)
+        
+        self.is_trained = True
+        self._prepare_inference()
+        
+        # Pass 4: evaluate on the held-out rows (same split as pass 3)
+        midpoints = self._bin_midpoints()
+        n_test = abs_error = sq_error = y_sum = y_sq_sum = 0.0
+        rng = np.random.default_rng(random_state)
+        for chunk in chunks():
+            test = rng.random(len(chunk)) < test_size
+            if not test.any():
+                continue
+            X, _ = self._encode_frame(chunk[test])
+            y_true = midpoints[self._price_to_bin(chunk[TARGET_COLUMN].values[test])]
+            y_pred = midpoints[self._kernel.predict(X)]
+            n_test += len(y_true)
+            abs_error += np.abs(y_true - y_pred).sum()
+            sq_error += ((y_true - y_pred) ** 2).sum()
+            y_sum += y_true.sum()
+            y_sq_sum += (y_true ** 2).sum()
+        
+        mae = abs_error / n_test
+        rmse = np.sqrt(sq_error / n_test)
+        r2 = 1 - sq_error / (y_sq_sum - y_sum ** 2 / n_test)
+        
+        print("\nModel Performance:")
+        print(f"MAE: ₹{mae:.2f} lakhs")
+        print(f"RMSE: ₹{rmse:.2f} lakhs")
+        print(f"R² Score: {r2:.4f}")
+        
         return mae, rmse, r2
     
+    def update(self, csv_path, chunksize=100000):
+        """Continue training on new rows, e.g. a new auction season
+
+        Encoders, scaler and price bins stay fixed so the existing class
+        statistics remain valid. Rows with categories or price bins the
+        model has never seen are skipped.
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained. Please train the model first.")
+        
+        import pandas as pd
+        
+        added = skipped = 0
+        usecols = self.feature_columns + [TARGET_COLUMN]
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize, usecols=usecols):
+            X, known = self._encode_frame(chunk)
+            prices = chunk[TARGET_COLUMN].values
+            y = self._price_to_bin(prices)
+            keep = known & ~np.isnan(prices) & np.isin(y, self.model.classes_)
+            if keep.any():
+                self.model.partial_fit(self._scale_rows(X[keep]), y[keep])
+            added += int(keep.sum())
+            skipped += int((~keep).sum())
+        
+        # New parameters, not saved yet
+        self._prepare_inference()
+        self.model_version = None
+        self.model_created_at = None
+        
+        print(f"Updated model with {added} rows ({skipped} skipped)")
+        return added, skipped
+    
+    def _encode_frame(self, df):
+        """Encode a DataFrame chunk into raw feature rows
+
+        Returns the (n, n_features) matrix and a mask of the rows whose
+        categories are all known to the fitted encoders.
+        """
+        import pandas as pd
+        
+        vocabularies = self._vocabularies()
+        X = np.empty((len(df), len(self.feature_columns)))
+        known = np.ones(len(df), dtype=bool)
+        for j, col in enumerate(self.feature_columns):
+            if col in vocabularies:
+                codes = pd.Categorical(df[col].astype(str), categories=vocabularies[col]).codes
+                known &= codes >= 0
+                X[:, j] = codes
+            else:
+                X[:, j] = df[col].fillna(0).values
+        return X, known
+    
+    def _scale_rows(self, X):
+        """StandardScaler.transform for plain arrays"""
+        if self._bundle is not None:
+            arrays = self._bundle[0]
+            return (X - arrays['scaler_mean']) / arrays['scaler_scale']
+        return (X - self.scaler.mean_) / self.scaler.scale_
+    
+    def _price_to_bin(self, prices):
+        """Bin index of each price, as in create_price_bins"""
+        return np.digitize(prices, self.price_bins[1:-1])
+    
+    def _bin_midpoints(self):
+        """price_from_bin for every bin index"""
+        return np.array([self.price_from_bin(i) for i in range(len(self.price_bins))])
+    
     def predict(self, player_data):
         """Predict auction price for a player"""
         if not self.is_trained:
             raise ValueError("Model not trained. Please train the model first.")
         
-        # Convert dict to DataFrame
-        df = pd.DataFrame([player_data])
+        # Encode straight into a feature row, no DataFrame round-trip
+        started = time.perf_counter()
+        X, report = self.schema.encode(player_data)
+        if self.stage_timer is not None:
+            self.stage_timer.observe(time.perf_counter() - started, 'encode')
+        
+        cache = self.prediction_cache
+        cached = None
+        if cache is not None:
+            key = cache.key_for(X, self.model_version)
+            cached = cache.get(key)
+        
+        if cached is not None:
+            result = {**cached, 'price_range': dict(cached['price_range'])}
+        else:
+            if self.batcher is not None:
+                result = self.batcher.submit(self, X)
+            else:
+                result = self.predict_encoded(X)[0]
+            if cache is not None:
+                cache.put(key, {**result, 'price_range': dict(result['price_range'])})
+        
+        # Unknown categories/fields depend on the raw payload, not the row
+        if report:
+            result.update(report)
+        return result
+    
+    def predict_encoded(self, X):
+        """Predict from already-encoded raw feature rows (n, n_features)"""
+        X = np.asarray(X, dtype=np.float64)
+        # The kernel doesn't validate its input (inf - inf scores as NaN),
+        # so reject what sklearn's check_array used to
+        if not np.isfinite(X).all():
+            raise ValueError("Input contains infinity or NaN")
+        # One scoring pass gives both the bin (argmax) and confidence.
+        # Scaling is folded into the kernel, so "score" includes it.
+        timer = self.stage_timer
+        started = time.perf_counter()
+        proba = self._kernel.predict_proba(X)
+        if timer is None:
+            return self._format_predictions(proba)
+        
+        scored = time.perf_counter()
+        predictions = self._format_predictions(proba)
+        timer.observe(scored - started, 'score')
+        timer.observe(time.perf_counter() - scored, 'postprocess')
+        return predictions
+    
+    def _prepare_inference(self):
+        """Precompute lookup tables used by the prediction fast path"""
+        self._category_codes = {
+            col: {str(label): code for code, label in enumerate(labels)}
+            for col, labels in self._vocabularies().items()
+        }
+        # Scaler and GaussianNB compiled into one kernel over raw features,
+        # straight from the bundle arrays when sklearn isn't loaded
+        if self._bundle is not None:
+            arrays = self._bundle[0]
+            self._feature_means = np.array(arrays['scaler_mean'])
+            self._kernel = FusedGaussianNB.from_params(
+                arrays['scaler_mean'], arrays['scaler_scale'], arrays['theta'], arrays['var'],
+                arrays['class_prior'], arrays['classes'], dtype=self.kernel_dtype)
+        else:
+            self._feature_means = np.array(self.scaler.mean_)
+            self._kernel = FusedGaussianNB.from_estimators(self.scaler, self.model, dtype=self.kernel_dtype)
+        self.schema = PlayerSchema(self.feature_columns, self._vocabularies(), self._feature_means)
+    
+    def predict_batch(self, players):
+        """Predict auction prices for many players in one vectorized pass
+
+        ``players`` may be a list of player dicts, a dict of columns or a
+        DataFrame. One result is returned per input row; rows that fail
+        validation carry an error instead of failing the whole batch, and
+        unknown categories are reported on the row's prediction.
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained. Please train the model first.")
+        
+        started = time.perf_counter()
+        X, errors, reports = self.schema.encode_batch(players)
+        n_rows = len(errors)
         
-        # Preprocess
-        X = self.preprocess_data(df, fit=False)
+        valid = np.array([not row_errors for row_errors in errors], dtype=bool)
+        results = []
+        if self.stage_timer is not None:
+            self.stage_timer.observe(time.perf_counter() - started, 'encode')
         
-        # Predict bin
-        bin_pred = self.model.predict(X)[0]
+        if valid.any():
+            predictions = iter(self.predict_encoded(X[valid]))
         
-        # Convert to price
-        price = self.price_from_bin(bin_pred)
+        for i in range(n_rows):
+            if valid[i]:
+                prediction = next(predictions)
+                if reports[i]:
+                    prediction.update(reports[i])
+                results.append({'index': i, 'success': True, 'prediction': prediction})
+            else:
+                results.append({'index': i, 'success': False, 'error': '; '.join(errors[i])})
         
-        # Get probability distribution
-        proba = self.model.predict_proba(X)[0]
-        confidence = max(proba) * 100
+        return results
+    
+    def what_if(self, player_data, grids, max_variants=50000):
+        """Score a base player over a grid of one or two feature values
+
+        ``grids`` maps each varied feature to a list of values or to
+        {'start', 'stop', 'num'} (inclusive, like np.linspace). All
+        variants are scored in one vectorized pass. Returns the price and
+        confidence surfaces, shaped like the grid, and every step along an
+        axis where the predicted bin changes.
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained. Please train the model first.")
+        if not isinstance(grids, dict) or not 1 <= len(grids) <= 2:
+            raise ValueError("Vary one or two features")
+        
+        base, report = self.schema.encode(player_data)
+        features = list(grids)
+        values = [self._grid_values(col, grids[col], max_variants) for col in features]
+        shape = tuple(len(codes) for codes, _ in values)
+        if int(np.prod(shape)) > max_variants:
+            raise ValueError(f"Grid has {int(np.prod(shape))} variants, the limit is {max_variants}")
+        
+        # One row per grid point, varied columns overwritten from a meshgrid
+        X = np.repeat(base, int(np.prod(shape)), axis=0)
+        mesh = np.meshgrid(*[codes for codes, _ in values], indexing='ij')
+        for col, axis_values in zip(features, mesh):
+            X[:, self.feature_columns.index(col)] = axis_values.ravel()
+        
+        proba = self._kernel.predict_proba(X)
+        best = proba.argmax(axis=1)
+        bins = self._kernel.classes[best].reshape(shape)
+        prices = np.round(self._bin_midpoints()[bins], 2)
+        confidence = np.round(proba[np.arange(len(best)), best] * 100, 2).reshape(shape)
+        
+        labels = [labels for _, labels in values]
+        thresholds = []
+        for axis, col in enumerate(features):
+            # Grid points whose bin differs from the next point along this axis
+            changed = np.diff(bins, axis=axis) != 0
+            for index in zip(*np.nonzero(changed)):
+                after = list(index)
+                after[axis] += 1
+                after = tuple(after)
+                step = {
+                    'feature': col,
+                    'between': [labels[axis][index[axis]], labels[axis][after[axis]]],
+                    'from_price': float(prices[index]),
+                    'to_price': float(prices[after])
+                }
+                if len(features) == 2:
+                    other = 1 - axis
+                    step['at'] = {features[other]: labels[other][index[other]]}
+                thresholds.append(step)
         
         return {
-            'predicted_price': round(price, 2),
-            'confidence': round(confidence, 2),
-            'price_range': {
-                'min': round(self.price_bins[max(0, bin_pred - 1)], 2),
-                'max': round(self.price_bins[min(len(self.price_bins) - 1, bin_pred + 1)], 2)
-            }
+            'features': features,
+            'values': labels,
+            'predicted_price': prices.tolist(),
+            'confidence': confidence.tolist(),
+            'thresholds': thresholds,
+            **report
         }
     
+    def _grid_values(self, col, spec, max_len):
+        """(encoded values, JSON labels) for one what-if axis"""
+        if col not in self.feature_columns:
+            raise ValueError(f"Unknown feature: {col}")
+        if isinstance(spec, dict):
+            try:
+                start, stop, num = float(spec['start']), float(spec['stop']), int(spec['num'])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"Grid for {col} needs numeric start, stop and num")
+            if num > max_len:
+                raise ValueError(f"Grid for {col} has {num} values, the limit is {max_len}")
+            spec = np.linspace(start, stop, num).tolist()
+        if not isinstance(spec, list) or not spec:
+            raise ValueError(f"Grid for {col} must be a non-empty list")
+        
+        codes = self._category_codes.get(col)
+        if codes is not None:
+            labels = [str(value) for value in spec]
+            unknown = [label for label in labels if label not in codes]
+            if unknown:
+                raise ValueError(f"Unknown {col}: '{unknown[0]}'")
+            return np.array([codes[label] for label in labels], dtype=np.float64), labels
+        
+        try:
+            encoded = np.array(spec, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError(f"Grid for {col} must be numeric")
+        return np.nan_to_num(encoded, nan=0.0), spec
+    
+    def _format_predictions(self, proba):
+        """Turn rows of class probabilities into prediction dicts"""
+        best = proba.argmax(axis=1)
+        bins = self._kernel.classes[best]
+        confidences = proba[np.arange(len(best)), best] * 100
+        last = len(self.price_bins) - 1
+        
+        predictions = []
+        for bin_pred, confidence in zip(bins.tolist(), confidences.tolist()):
+            predictions.append({
+                'predicted_price': round(float(self.price_from_bin(bin_pred)), 2),
+                'confidence': round(confidence, 2),
+                'price_range': {
+                    'min': round(float(self.price_bins[max(0, bin_pred - 1)]), 2),
+                    'max': round(float(self.price_bins[min(last, bin_pred + 1)]), 2)
+                }
+            })
+        return predictions
+    
     def save_model(self, path='model_artifacts'):
-        """Save trained model and preprocessors"""
+        """Save trained model and preprocessors as a single bundle file"""
         os.makedirs(path, exist_ok=True)
         
-        with open(f'{path}/naive_bayes_model.pkl', 'wb') as f:
-            pickle.dump(self.model, f)
-        
-        with open(f'{path}/scaler.pkl', 'wb') as f:
-            pickle.dump(self.scaler, f)
-        
-        with open(f'{path}/label_encoders.pkl', 'wb') as f:
-            pickle.dump(self.label_encoders, f)
-        
-        with open(f'{path}/price_bins.pkl', 'wb') as f:
-            pickle.dump(self.price_bins, f)
+        arrays = {
+            'classes': np.asarray(self.model.classes_, dtype=np.int64),
+            'class_count': self.model.class_count_,
+            'class_prior': self.model.class_prior_,
+            'theta': self.model.theta_,
+            'var': self.model.var_,
+            'scaler_mean': self.scaler.mean_,
+            'scaler_var': self.scaler.var_,
+            'scaler_scale': self.scaler.scale_,
+            'price_bins': np.asarray(self.price_bins, dtype=np.float64)
+        }
+        metadata = {
+            'feature_columns': list(self.feature_columns),
+            'categories': {
+                col: [str(label) for label in encoder.classes_]
+                for col, encoder in self.label_encoders.items()
+            },
+            'var_smoothing': self.model.var_smoothing,
+            'epsilon': float(self.model.epsilon_),
+            'scaler_n_samples_seen': int(np.max(self.scaler.n_samples_seen_)),
+            'created_at': datetime.now(timezone.utc).isoformat()
+        }
         
-        with open(f'{path}/feature_columns.pkl', 'wb') as f:
-            pickle.dump(self.feature_columns, f)
+        header = write_bundle(os.path.join(path, BUNDLE_FILE), arrays, metadata)
+        self.model_version = header['model_version']
+        self.model_created_at = header['created_at']
         
-        print(f"Model saved to {path}/")
+        print(f"Model saved to {path}/{BUNDLE_FILE}")
     
     def load_model(self, path='model_artifacts'):
-        """Load trained model and preprocessors"""
-        with open(f'{path}/naive_bayes_model.pkl', 'rb') as f:
-            self.model = pickle.load(f)
-        
-        with open(f'{path}/scaler.pkl', 'rb') as f:
-            self.scaler = pickle.load(f)
-        
-        with open(f'{path}/label_encoders.pkl', 'rb') as f:
-            self.label_encoders = pickle.load(f)
-        
-        with open(f'{path}/price_bins.pkl', 'rb') as f:
-            self.price_bins = pickle.load(f)
-        
-        with open(f'{path}/feature_columns.pkl', 'rb') as f:
-            self.feature_columns = pickle.load(f)
+        """Load trained model and preprocessors
+
+        Prefers the single-file bundle and falls back to the legacy pickles
+        written by older versions.
+        """
+        bundle_path = os.path.join(path, BUNDLE_FILE)
+        if os.path.exists(bundle_path):
+            self._load_bundle(bundle_path)
+        else:
+            self._load_pickles(path)
         
         self.is_trained = True
+        self._prepare_inference()
         print(f"Model loaded from {path}/")
+    
+    def _load_bundle(self, bundle_path):
+        """Map a model bundle; sklearn estimators are built from it on demand"""
+        arrays, header = read_bundle(bundle_path)
+        
+        self._bundle = (arrays, header)
+        self._model = self._scaler = self._label_encoders = None
+        self.price_bins = np.array(arrays['price_bins'])
+        self.feature_columns = list(header['feature_columns'])
+        self.model_version = header['model_version']
+        self.model_created_at = header['created_at']
+    
+    def _load_pickles(self, path):
+        """Load the five legacy pickle files"""
+        digest = hashlib.sha256()
+        loaded = {}
+        for name in LEGACY_PICKLES:
+            with open(f'{path}/{name}.pkl', 'rb') as f:
+                data = f.read()
+            digest.update(data)
+            loaded[name] = pickle.loads(data)
+        
+        self._bundle = None
+        self.model = loaded['naive_bayes_model']
+        self.scaler = loaded['scaler']
+        self.label_encoders = loaded['label_encoders']
+        self.price_bins = loaded['price_bins']
+        self.feature_columns = loaded['feature_columns']
+        self.model_version = 'legacy-' + digest.hexdigest()[:12]
+        self.model_created_at = None
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the IPL auction price model")
+    parser.add_argument('--data', default='players_dataset.csv', help="training CSV")
+    parser.add_argument('--stream', action='store_true',
+                        help="train out-of-core, reading the CSV in chunks")
+    parser.add_argument('--update', metavar='CSV',
+                        help="continue training the saved model on new rows")
+    parser.add_argument('--chunksize', type=int, default=100000,
+                        help="rows per chunk for --stream/--update")
+    args = parser.parse_args()
+    
     # Train and save model
     predictor = IPLAuctionPredictor()
-    predictor.train('players_dataset.csv')
+    if args.update:
+        predictor.load_model()
+        predictor.update(args.update, chunksize=args.chunksize)
+    elif args.stream:
+        predictor.train_streaming(args.data, chunksize=args.chunksize)
+    else:
+        predictor.train(args.data)
     predictor.save_model()
     
     # Test prediction
@@ -0,0 +1,146 @@
+"""Single-file, memory-mappable model bundle
+
+Layout of ``model.bundle``::
+
+    8 bytes   magic b'IPLMODEL'
+    4 bytes   format version (uint32, little endian)
+    4 bytes   header length in bytes (uint32, little endian)
+    header    UTF-8 JSON: feature order, category vocabularies, scalar
+              parameters, array table and a SHA-256 checksum
+    padding   up to a 64-byte boundary
+    payload   raw little-endian arrays, each 64-byte aligned
+
+The checksum covers the header and the payload. Bundles are written to a
+temporary file and renamed into place, so a reader only ever sees a
+complete bundle or the previous one. Loading only needs NumPy: the arrays
+are read-only views on a shared mmap of the file.
+"""
+import hashlib
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+MAGIC = b'IPLMODEL'
+FORMAT_VERSION = 1
+ALIGN = 64
+_PREFIX = struct.Struct('<8sII')
+
+
+class BundleError(ValueError):
+    """Raised when a bundle is truncated, corrupt or of an unknown format"""
+
+
+def _align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _checksum(header, payload):
+    digest = hashlib.sha256()
+    digest.update(json.dumps(header, sort_keys=True).encode('utf-8'))
+    digest.update(payload)
+    return digest.hexdigest()
+
+
+def write_bundle(path, arrays, metadata):
+    """Atomically write arrays plus JSON-serialisable metadata to path
+
+    Returns the header that was written, including ``model_version``.
+    """
+    table = {}
+    chunks = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        array = array.astype(array.dtype.newbyteorder('<'), copy=False)
+        start = _align(offset)
+        chunks.append(b'\0' * (start - offset))
+        chunks.append(array.tobytes())
+        table[name] = {'offset': start, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+        offset = start + array.nbytes
+    payload = b''.join(chunks)
+
+    header = dict(metadata)
+    header['arrays'] = table
+    header['payload_size'] = len(payload)
+    checksum = _checksum(header, payload)
+    header['checksum'] = checksum
+    header['model_version'] = checksum[:12]
+
+    header_bytes = json.dumps(header, sort_keys=True).encode('utf-8')
+    prefix = _PREFIX.pack(MAGIC, FORMAT_VERSION, len(header_bytes))
+    data_start = _align(len(prefix) + len(header_bytes))
+    padding = b'\0' * (data_start - len(prefix) - len(header_bytes))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.model-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(prefix)
+            f.write(header_bytes)
+            f.write(padding)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files, artifacts should be readable like the pickles
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return header
+
+
+def _read_header(path):
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise BundleError(f"{path} is truncated")
+        magic, version, header_size = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise BundleError(f"{path} is not a model bundle")
+        if version != FORMAT_VERSION:
+            raise BundleError(f"Unsupported bundle format version {version}")
+        header_bytes = f.read(header_size)
+    if len(header_bytes) < header_size:
+        raise BundleError(f"{path} is truncated")
+    return json.loads(header_bytes.decode('utf-8')), header_size
+
+
+def read_header(path):
+    """Read and parse only the header of a bundle"""
+    return _read_header(path)[0]
+
+
+def read_bundle(path, verify=True):
+    """Map a bundle and return (arrays, header)
+
+    Arrays are read-only views on one shared mmap of the file.
+    """
+    header, header_size = _read_header(path)
+    data_start = _align(_PREFIX.size + header_size)
+
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    payload = buffer[data_start:data_start + header['payload_size']]
+    if len(payload) < header['payload_size']:
+        raise BundleError(f"{path} is truncated")
+
+    if verify:
+        expected = header['checksum']
+        unsigned = {k: v for k, v in header.items() if k not in ('checksum', 'model_version')}
+        if _checksum(unsigned, payload) != expected:
+            raise BundleError(f"{path} failed its checksum")
+
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        start = spec['offset']
+        raw = payload[start:start + count * dtype.itemsize]
+        arrays[name] = raw.view(dtype).reshape(spec['shape'])
+
+    return arrays, header
@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from model import BUNDLE_FILE, LEGACY_PICKLES
+
+
+class ModelManager:
+    """Holds the active predictor and hot-swaps newly saved artifacts
+
+    Request handlers grab ``manager.predictor`` once and use that object
+    for the whole request. A reload builds and validates a fresh predictor
+    off to the side and then rebinds the attribute, so in-flight requests
+    finish on the model they started with.
+    """
+
+    def __init__(self, path, factory, poll_interval=0):
+        self.path = path
+        self.factory = factory
+        self.poll_interval = poll_interval
+        self.predictor = factory()
+        self.loaded_at = None
+        self.last_error = None
+        self.last_load_seconds = None
+        self.loads = 0
+        self.load_failures = 0
+        self._signature = None
+        self._failed_signature = None
+        self._reload_lock = threading.Lock()
+        self._poller_lock = threading.Lock()
+        self._poller_pid = None
+        self._swap_listeners = []
+
+    def artifact_signature(self):
+        """Identity of the artifacts on disk, changes whenever they are rewritten"""
+        bundle_path = os.path.join(self.path, BUNDLE_FILE)
+        if os.path.exists(bundle_path):
+            paths = [bundle_path]
+        else:
+            paths = [os.path.join(self.path, f'{name}.pkl') for name in LEGACY_PICKLES]
+
+        signature = []
+        for path in paths:
+            stat = os.stat(path)
+            signature.append((path, stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def load(self):
+        """Load, validate and swap in the artifacts currently on disk
+
+        Returns True if a new model went live. On failure the active model
+        is kept and the error re-raised.
+        """
+        with self._reload_lock:
+            signature = None
+            started = time.perf_counter()
+            try:
+                signature = self.artifact_signature()
+                candidate = self.factory()
+                candidate.load_model(self.path)
+                self._validate(candidate)
+            except Exception as e:
+                self.last_error = str(e)
+                self._failed_signature = signature
+                self.load_failures += 1
+                raise
+
+            self.last_load_seconds = time.perf_counter() - started
+            self.loads += 1
+            self._signature = signature
+            self.last_error = None
+            if candidate.model_version == self.predictor.model_version and self.predictor.is_trained:
+                return False
+
+            # Single reference assignment, atomic for concurrent readers
+            self.predictor = candidate
+            self.loaded_at = datetime.now(timezone.utc)
+            for listener in self._swap_listeners:
+                listener(candidate)
+            print(f"Model version {candidate.model_version} is live")
+            return True
+
+    def add_swap_listener(self, listener):
+        """Call listener(predictor) whenever a new model goes live"""
+        self._swap_listeners.append(listener)
+
+    def reload_if_changed(self):
+        """Reload when the artifacts on disk differ from the last load"""
+        try:
+            signature = self.artifact_signature()
+        except OSError:
+            # Artifacts missing or mid-replacement, try again next poll
+            return False
+        # Unchanged, or the same broken artifacts that already failed
+        if signature in (self._signature, self._failed_signature):
+            return False
+        return self.load()
+
+    def _validate(self, candidate):
+        """Score a probe row so a broken artifact never goes live"""
+        if not candidate.feature_columns:
+            raise ValueError("Model has no feature columns")
+        probe = np.asarray(candidate._feature_means, dtype=np.float64)[None, :]
+        proba = candidate._kernel.predict_proba(probe)
+        if not np.all(np.isfinite(proba)) or not np.isclose(proba.sum(), 1.0):
+            raise ValueError("Model produced invalid probabilities")
+        if np.max(candidate._kernel.classes) >= len(candidate.price_bins):
+            raise ValueError("Model classes do not match its price bins")
+
+    def ensure_polling(self):
+        """Start the artifact watcher in this process if it isn't running
+
+        Cheap enough to call per request; forked workers get their own.
+        """
+        if self.poll_interval <= 0 or self._poller_pid == os.getpid():
+            return
+        with self._poller_lock:
+            if self._poller_pid == os.getpid():
+                return
+            self._poller_pid = os.getpid()
+        thread = threading.Thread(target=self._poll, name='model-poller', daemon=True)
+        thread.start()
+
+    def _poll(self):
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                print(f"Model reload failed, keeping version {self.predictor.model_version}: {e}")
+
+    def status(self):
+        """Active model details for /api/health"""
+        return {
+            'model_loaded': self.predictor.is_trained,
+            'model_version': self.predictor.model_version,
+            'model_created_at': self.predictor.model_created_at,
+            'model_loaded_at': self.loaded_at.isoformat() if self.loaded_at else None,
+            'model_load_seconds': round(self.last_load_seconds, 4) if self.last_load_seconds is not None else None,
+            'last_reload_error': self.last_error
+        }
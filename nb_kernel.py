@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class FusedGaussianNB:
+    """GaussianNB scoring with the StandardScaler folded into its parameters
+
+    GaussianNB scores a scaled row z = (x - mean) / scale against class c as
+
+        log prior_c - 0.5 * sum(log(2 pi var_c)) - 0.5 * sum((z - theta_c)^2 / var_c)
+
+    The scaling is affine, so the same score over raw features is
+
+        const_c - 0.5 * sum(((x - centre_c) * inv_std_c)^2)
+
+    with centre = mean + scale * theta and inv_std = 1 / (scale * sqrt(var))
+    in raw feature units, and const_c precomputed. The square is kept
+    unexpanded: var_ can be as small as GaussianNB's epsilon, and expanding
+    it cancels huge terms, which would wreck float32 scoring.
+
+    There is no input validation: callers must pass finite rows. An
+    infinite feature scores as inf - inf and gives NaN probabilities.
+    """
+
+    # Rows scored per step, bounds the (rows, classes, features) temporary
+    chunk_size = 2048
+
+    def __init__(self, centres, inv_std, const, classes, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.centres = np.asarray(centres, dtype=self.dtype)
+        self.inv_std = np.asarray(inv_std, dtype=self.dtype)
+        self.const = np.asarray(const, dtype=self.dtype)
+        self.classes = np.asarray(classes)
+
+    @classmethod
+    def from_estimators(cls, scaler, model, dtype=np.float64):
+        """Compile a fitted StandardScaler + GaussianNB pair"""
+        return cls.from_params(scaler.mean_, scaler.scale_, model.theta_, model.var_,
+                               model.class_prior_, model.classes_, dtype=dtype)
+
+    @classmethod
+    def from_params(cls, mean, scale, theta, var, class_prior, classes, dtype=np.float64):
+        """Compile from the fitted arrays themselves, no sklearn needed"""
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+        theta = np.asarray(theta, dtype=np.float64)
+        var = np.asarray(var, dtype=np.float64)
+
+        centres = mean + scale * theta
+        inv_std = 1.0 / (scale * np.sqrt(var))
+        const = np.log(class_prior) - 0.5 * np.sum(np.log(2.0 * np.pi * var), axis=1)
+
+        return cls(centres, inv_std, const, np.array(classes), dtype=dtype)
+
+    @property
+    def n_features(self):
+        return self.centres.shape[1]
+
+    def joint_log_likelihood(self, X):
+        """Per-class joint log-likelihood for raw (unscaled) feature rows"""
+        X = np.asarray(X, dtype=self.dtype)
+        jll = np.empty((X.shape[0], self.const.shape[0]), dtype=self.dtype)
+
+        for start in range(0, X.shape[0], self.chunk_size):
+            stop = start + self.chunk_size
+            d = (X[start:stop, None, :] - self.centres) * self.inv_std
+            jll[start:stop] = self.const - 0.5 * np.einsum('nkf,nkf->nk', d, d)
+
+        return jll
+
+    def predict_proba(self, X):
+        """Class probabilities, matching GaussianNB.predict_proba"""
+        jll = self.joint_log_likelihood(X)
+        jll -= jll.max(axis=1, keepdims=True)
+        proba = np.exp(jll)
+        proba /= proba.sum(axis=1, keepdims=True)
+        return proba
+
+    def predict(self, X):
+        return self.classes[self.joint_log_likelihood(X).argmax(axis=1)]
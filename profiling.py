@@ -0,0 +1,226 @@
+"""Opt-in profiling of single requests and of model training
+
+Request profiling is only wired into the app when PROFILE_REQUESTS=1,
+so it costs nothing otherwise. Then a request sent with ``X-Profile: 1``
+or ``?profile=1`` is profiled on its own and leaves files in PROFILE_DIR:
+
+    <id>.collapsed  folded stacks for flamegraph.pl / speedscope (sampling)
+    <id>.txt        top functions by inclusive and self time
+    <id>.pstats     raw cProfile stats (with ?profile=cprofile)
+
+The default sampling profiler reads the request thread's stack every
+PROFILE_SAMPLE_INTERVAL_MS from a side thread; ``cprofile`` traces every
+call instead, which is exact but slows Python-heavy code down.
+
+Usage (training):
+    python profiling.py train [--data players_dataset.csv] [--stream] [--mode cprofile]
+"""
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+MODES = ('sample', 'cprofile')
+TOP_N = 40
+
+# Sampling needs the GIL handed over at least as often as it samples;
+# the switch interval is lowered while any sampler runs
+_switch_lock = threading.Lock()
+_active_samplers = 0
+_saved_switch_interval = None
+
+
+def _frame_label(code):
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval"""
+
+    def __init__(self, thread_id=None, interval=0.001):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        global _active_samplers, _saved_switch_interval
+        with _switch_lock:
+            if _active_samplers == 0:
+                _saved_switch_interval = sys.getswitchinterval()
+                sys.setswitchinterval(min(_saved_switch_interval, self.interval / 2))
+            _active_samplers += 1
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        global _active_samplers
+        self._stop.set()
+        self._thread.join()
+        with _switch_lock:
+            _active_samplers -= 1
+            if _active_samplers == 0:
+                sys.setswitchinterval(_saved_switch_interval)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def collapsed(self):
+        """Folded stacks, one "root;...;leaf count" line per distinct stack"""
+        return ''.join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top=TOP_N):
+        total = sum(self.stacks.values())
+        inclusive = Counter()
+        own = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                inclusive[label] += count
+
+        lines = [f'{total} samples at {self.interval * 1000:g} ms', '',
+                 f"{'total%':>7} {'self%':>7}  function"]
+        for label, count in inclusive.most_common(top):
+            lines.append(f'{100 * count / total:>6.1f}% {100 * own[label] / total:>6.1f}%  {label}')
+        return '\n'.join(lines) + '\n'
+
+
+class Profile:
+    """Profile a block of code and write its reports into a directory"""
+
+    def __init__(self, directory, name, mode='sample', interval=0.001):
+        if mode not in MODES:
+            raise ValueError(f"Profile mode must be one of: {', '.join(MODES)}")
+        self.directory = directory
+        self.mode = mode
+        self.interval = interval
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{uuid.uuid4().hex[:8]}"
+        self._profiler = None
+        self._started = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        if self.mode == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._profiler = StackSampler(interval=self.interval)
+            self._profiler.start()
+        return self
+
+    def stop(self):
+        """Stop profiling and write the reports; returns the base path"""
+        if self.mode == 'cprofile':
+            self._profiler.disable()
+        else:
+            self._profiler.stop()
+        elapsed = time.perf_counter() - self._started
+
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, self.id)
+        header = f'{self.id}: {elapsed * 1000:.1f} ms wall time\n'
+        if self.mode == 'cprofile':
+            self._profiler.dump_stats(base + '.pstats')
+            out = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=out)
+            stats.sort_stats('cumulative').print_stats(TOP_N)
+            summary = out.getvalue()
+        else:
+            with open(base + '.collapsed', 'w') as f:
+                f.write(self._profiler.collapsed())
+            summary = self._profiler.summary()
+        with open(base + '.txt', 'w') as f:
+            f.write(header + summary)
+        return base
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _requested_mode(request):
+    value = request.headers.get('X-Profile') or request.args.get('profile')
+    if not value or value.lower() in ('0', 'false', 'no'):
+        return None
+    return 'cprofile' if value.lower() == 'cprofile' else 'sample'
+
+
+def install_request_profiler(app, directory='profiles', interval=0.001):
+    """Profile requests that ask for it with X-Profile or ?profile="""
+    from flask import g, request
+
+    @app.before_request
+    def start_request_profile():
+        mode = _requested_mode(request)
+        if mode is None:
+            return
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '-', request.path.strip('/'))[:60] or 'root'
+        g.request_profile = Profile(directory, name, mode=mode, interval=interval).start()
+
+    @app.after_request
+    def finish_request_profile(response):
+        profile = g.pop('request_profile', None)
+        if profile is None:
+            return response
+        response.headers['X-Profile-Id'] = profile.id
+        if response.is_streamed:
+            # Streamed bodies (e.g. NDJSON upload scoring) are produced after
+            # this hook, on the same thread, so stop once the body is done
+            response.call_on_close(profile.stop)
+        else:
+            profile.stop()
+        return response
+
+    @app.teardown_request
+    def abandon_request_profile(exc):
+        # A request that never reached after_request still gets its report
+        profile = g.pop('request_profile', None)
+        if profile is not None:
+            profile.stop()
+
+
+def profile_training(data, directory='profiles', mode='sample', stream=False, chunksize=100000):
+    """Train IPLAuctionPredictor end to end under the profiler"""
+    from model import IPLAuctionPredictor
+
+    predictor = IPLAuctionPredictor()
+    profile = Profile(directory, 'train-stream' if stream else 'train', mode=mode)
+    with profile:
+        if stream:
+            predictor.train_streaming(data, chunksize=chunksize)
+        else:
+            predictor.train(data)
+    return os.path.join(directory, profile.id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile model training")
+    parser.add_argument('command', choices=['train'])
+    parser.add_argument('--data', default='players_dataset.csv')
+    parser.add_argument('--stream', action='store_true', help="profile train_streaming instead")
+    parser.add_argument('--chunksize', type=int, default=100000)
+    parser.add_argument('--mode', choices=MODES, default='sample')
+    parser.add_argument('--out', default='profiles', help="directory for the reports")
+    args = parser.parse_args()
+
+    base = profile_training(args.data, args.out, args.mode, args.stream, args.chunksize)
+    with open(base + '.txt') as f:
+        print(f.read())
+    print(f"Reports written to {base}.*")
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch (KLL-style compactors)
+
+    Values land in level 0. Whenever a level holds more than ``capacity``
+    items it is sorted and every other item (random offset) is promoted
+    to the next level with twice the weight. Memory stays around
+    capacity * log2(n / capacity) items and, until the first compaction,
+    quantiles are exact and match np.percentile.
+    """
+
+    def __init__(self, capacity=4096, seed=0):
+        self.capacity = capacity
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """Fold another sketch into this one"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.capacity:
+                level = np.sort(level)
+                # An odd item out stays behind at this level
+                keep = level[len(level) - len(level) % 2:]
+                pairs = level[:len(level) - len(level) % 2]
+                promoted = pairs[self._rng.integers(2)::2]
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantiles(self, qs):
+        """Approximate quantiles for qs in [0, 1]"""
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.count == 0:
+            raise ValueError("Sketch is empty")
+        if len(self.levels) == 1:
+            return np.percentile(self.levels[0], qs * 100)
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        weights = weights[order]
+
+        # Each item sits at the middle of the rank range it stands for
+        cumulative = np.cumsum(weights)
+        positions = (cumulative - weights / 2) / cumulative[-1]
+        positions = np.concatenate([[0.0], positions, [1.0]])
+        items = np.concatenate([[self.min], items, [self.max]])
+        return np.interp(qs, positions, items)
@@ -32,7 +32,7 @@ if exist "venv\Scripts\activate.bat" (
 )
 
 REM Check if model exists, train if needed
-if not exist "model_artifacts\naive_bayes_model.pkl" (
+if not exist "model_artifacts\model.bundle" if not exist "model_artifacts\naive_bayes_model.pkl" (
     echo Model not found. Training model now...
     echo This will take a moment...
     echo.
@@ -16,7 +16,7 @@ fi
 source venv/bin/activate
 
 # Check if model exists
-if [ ! -f "model_artifacts/naive_bayes_model.pkl" ]; then
+if [ ! -f "model_artifacts/model.bundle" ] && [ ! -f "model_artifacts/naive_bayes_model.pkl" ]; then
     echo "Model not found. Training model..."
     python model.py
     if [ $? -ne 0 ]; then
@@ -0,0 +1,228 @@
+"""Validation and encoding of player payloads into feature rows
+
+A PlayerSchema is compiled once per model from its feature order and
+category vocabularies, then coerces a single payload or a whole batch
+into a float64 matrix in one pass. A valid request never goes through an
+exception: presence is checked with a set comparison and values are
+converted by one NumPy call per payload (or per column for a batch),
+with a per-value fallback only to name bad input.
+
+Category labels the model never saw don't fail the request. They get the
+column's training mean as their code, which is the neutral value once
+scaled, and are reported back under ``unknown_categories``.
+"""
+import math
+from operator import itemgetter
+
+import numpy as np
+
+# Batches up to this many dict rows are encoded row by row, which beats
+# the fixed per-column cost of the vectorized pass
+ROW_AT_A_TIME_MAX = 32
+
+
+def _to_float(values):
+    """Float column plus a mask of values that aren't finite numbers
+
+    Like pd.to_numeric(errors='coerce'): numeric strings parse, None and
+    NaN become NaN without being flagged. ±inf (including overflowing
+    literals like 1e309) is flagged. Always returns a new array.
+    """
+    try:
+        numbers = np.array(values, dtype=np.float64)
+        if numbers.ndim == 1:
+            return numbers, np.isinf(numbers)
+    except (TypeError, ValueError):
+        pass
+    numbers = np.full(len(values), np.nan)
+    invalid = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        try:
+            numbers[i] = float(value)
+        except (TypeError, ValueError):
+            invalid[i] = True
+    return numbers, invalid | np.isinf(numbers)
+
+
+def _tuple_getter(keys):
+    """itemgetter that always returns a tuple, whatever len(keys) is"""
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda mapping: (mapping[key],)
+    if not keys:
+        return lambda mapping: ()
+    return itemgetter(*keys)
+
+
+class PlayerSchema:
+    """Feature layout of one fitted model
+
+    ``fallbacks`` holds one value per feature column (the training means);
+    only the categorical entries are used.
+    """
+
+    def __init__(self, feature_columns, vocabularies, fallbacks):
+        self.feature_columns = list(feature_columns)
+        self.required = frozenset(self.feature_columns)
+        self.codes = {
+            col: {str(label): float(code) for code, label in enumerate(labels)}
+            for col, labels in vocabularies.items() if col in self.required
+        }
+        self.numeric = [col for col in self.feature_columns if col not in self.codes]
+        self.categorical = [col for col in self.feature_columns if col in self.codes]
+        self.fallbacks = {
+            col: float(fallbacks[self.feature_columns.index(col)]) for col in self.categorical
+        }
+        self._categorical_slots = [
+            (self.feature_columns.index(col), col, self.codes[col], self.fallbacks[col])
+            for col in self.categorical
+        ]
+        self._get_numeric = _tuple_getter(self.numeric)
+        self._get_all = _tuple_getter(self.feature_columns)
+
+    @property
+    def n_features(self):
+        return len(self.feature_columns)
+
+    def missing(self, payload):
+        return [col for col in self.feature_columns if col not in payload]
+
+    def encode(self, payload):
+        """Encode one player dict into a (1, n_features) row
+
+        Returns (row, report); report lists unknown categories and fields
+        and is empty for a clean payload. Missing fields and values that
+        aren't finite numbers raise ValueError naming all of them.
+        """
+        if not isinstance(payload, dict):
+            raise ValueError('Player must be a JSON object')
+        if not self.required <= payload.keys():
+            raise ValueError(f"Missing fields: {', '.join(self.missing(payload))}")
+
+        values = list(self._get_all(payload))
+        report = {}
+        for j, col, codes, fallback in self._categorical_slots:
+            label = str(values[j])
+            code = codes.get(label)
+            if code is None:
+                report.setdefault('unknown_categories', {})[col] = label
+                code = fallback
+            values[j] = code
+
+        # One conversion for the whole row; only bad input takes the slow path
+        try:
+            X = np.array([values], dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError(self._invalid_values(payload))
+        # Missing numeric values (None/NaN) become 0, as in training, and
+        # ±inf is rejected. fsum over plain numbers is a much cheaper
+        # finiteness check than a NumPy call
+        try:
+            finite = math.isfinite(math.fsum(values))
+        except (TypeError, ValueError, OverflowError):
+            finite = False
+        if not finite:
+            X[np.isnan(X)] = 0.0
+            if not np.isfinite(X).all():
+                raise ValueError(self._invalid_values(payload))
+
+        if len(payload) > self.n_features:
+            report['unknown_fields'] = [key for key in payload if key not in self.required]
+        return X, report
+
+    def _invalid_values(self, payload):
+        """Error message naming every numeric field that isn't a finite number"""
+        _, invalid = _to_float(self._get_numeric(payload))
+        return '; '.join(
+            f'Invalid {self.numeric[i]}: {payload[self.numeric[i]]!r}' for i in np.flatnonzero(invalid))
+
+    def encode_batch(self, players):
+        """Encode a list of player dicts, a dict of columns or a DataFrame
+
+        Returns (X, errors, reports) with one entry per input row. errors
+        holds the messages that make a row unscorable, reports the
+        unknown categories (and for dict rows, unknown fields) of each row.
+        """
+        if isinstance(players, list) and len(players) <= ROW_AT_A_TIME_MAX:
+            return self._encode_rows(players)
+        if isinstance(players, list):
+            # Rows given as dicts may each leave out different fields
+            errors = []
+            for player in players:
+                if not isinstance(player, dict):
+                    errors.append(['Player must be a JSON object'])
+                elif self.required <= player.keys():
+                    errors.append([])
+                else:
+                    errors.append([f"Missing fields: {', '.join(self.missing(player))}"])
+            n_rows = len(players)
+            if n_rows and not any(errors):
+                # Every row has every field: transpose rows into columns in one go
+                columns = dict(zip(self.feature_columns, zip(*map(self._get_all, players))))
+            else:
+                rows = [p if isinstance(p, dict) else {} for p in players]
+                columns = {
+                    col: [row.get(col) for row in rows]
+                    for col in self.feature_columns if any(col in row for row in rows)
+                }
+            reports = [{} for _ in range(n_rows)]
+            for i, player in enumerate(players):
+                if isinstance(player, dict) and len(player) > self.n_features:
+                    extra = [key for key in player if key not in self.required]
+                    if extra:
+                        reports[i]['unknown_fields'] = extra
+        else:
+            # A DataFrame or a dict of equal-length columns
+            columns = {col: np.asarray(players[col]) for col in self.feature_columns if col in players}
+            n_rows = len(players) if hasattr(players, 'columns') else len(next(iter(players.values()), []))
+            missing = [col for col in self.feature_columns if col not in columns]
+            errors = [[f"Missing fields: {', '.join(missing)}"] if missing else [] for _ in range(n_rows)]
+            reports = [{} for _ in range(n_rows)]
+
+        X = np.zeros((n_rows, self.n_features))
+        # Only report bad values on rows that have all their fields
+        complete = np.array([not row_errors for row_errors in errors], dtype=bool)
+
+        for j, col in enumerate(self.feature_columns):
+            if col not in columns:
+                continue
+            values = columns[col]
+
+            codes = self.codes.get(col)
+            if codes is not None:
+                # Same string coercion as training, unseen labels get the fallback
+                labels = [str(value) for value in values]
+                encoded = np.array([codes.get(label, np.nan) for label in labels])
+                unknown = np.isnan(encoded)
+                if unknown.any():
+                    for i in np.flatnonzero(unknown & complete):
+                        reports[i].setdefault('unknown_categories', {})[col] = labels[i]
+                    encoded[unknown] = self.fallbacks[col]
+                X[:, j] = encoded
+            else:
+                numbers, invalid = _to_float(values)
+                for i in np.flatnonzero(invalid & complete):
+                    errors[i].append(f'Invalid {col}: {values[i]!r}')
+                numbers[np.isnan(numbers)] = 0.0
+                X[:, j] = numbers
+
+        return X, errors, reports
+
+    def _encode_rows(self, players):
+        """encode() per row, collecting errors instead of raising"""
+        X = np.zeros((len(players), self.n_features))
+        errors = []
+        reports = []
+        for i, player in enumerate(players):
+            try:
+                row, report = self.encode(player)
+            except ValueError as e:
+                errors.append([str(e)])
+                reports.append({})
+                continue
+            X[i] = row[0]
+            errors.append([])
+            reports.append(report)
+        return X, errors, reports
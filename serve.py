@@ -0,0 +1,95 @@
+"""Production server: one preloaded master process, forked gunicorn workers
+
+The master imports app, loads the dataset, builds the similarity and
+ranking indexes and checks /api/health before any worker exists. It then
+freezes the garbage collector and forks. Workers share those pages
+copy-on-write, so adding workers adds throughput without adding another
+copy of the model. Each worker runs the same readiness check before it
+accepts traffic, and is recycled after MAX_REQUESTS (plus jitter so they
+don't all restart at once).
+
+Usage:
+    python serve.py [any gunicorn option, e.g. -w 8 -b 127.0.0.1:8000]
+    gunicorn -c serve.py app:app
+
+Environment: PORT, WEB_CONCURRENCY (workers, default one per core),
+THREADS, REQUEST_TIMEOUT, GRACEFUL_TIMEOUT, MAX_REQUESTS,
+MAX_REQUESTS_JITTER, ACCESS_LOG=1, PRELOAD_DATASET=0 (skip the dataset
+and index warm-up for the fastest start; workers build them on demand).
+"""
+import gc
+import os
+import sys
+
+# gunicorn settings, read from this module by `gunicorn -c serve.py`
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+threads = int(os.environ.get('THREADS', 1))
+worker_class = 'gthread' if threads > 1 else 'sync'
+preload_app = True
+# A worker silent for longer than this is killed and replaced
+timeout = int(os.environ.get('REQUEST_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 30))
+max_requests = int(os.environ.get('MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('MAX_REQUESTS_JITTER', max_requests // 10))
+keepalive = 5
+# Worker heartbeats go to a tmpfs file instead of disk when there is one
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+accesslog = '-' if os.environ.get('ACCESS_LOG', '').lower() in ('1', 'true', 'yes') else None
+
+
+def check_ready(flask_app, through_hooks=True):
+    """Call /api/health in-process; returns (ready, health JSON)
+
+    The master skips the request hooks so it starts no per-process
+    threads (model poller, batcher) that would be half-copied into the
+    forked workers.
+    """
+    if through_hooks:
+        response = flask_app.test_client().get('/api/health')
+    else:
+        with flask_app.test_request_context('/api/health'):
+            response = flask_app.make_response(flask_app.view_functions['health_check']())
+    health = response.get_json(silent=True) or {}
+    return response.status_code == 200 and bool(health.get('model_loaded')), health
+
+
+def when_ready(server):
+    """Runs in the master after the app is preloaded, before any fork"""
+    import app as service
+
+    if os.environ.get('PRELOAD_DATASET', '1').lower() not in ('0', 'false', 'no'):
+        service.warm_caches()
+
+    ready, health = check_ready(service.app, through_hooks=False)
+    if not ready:
+        server.log.error(f"Not ready, refusing to start workers: {health}")
+        sys.exit(1)
+
+    # Everything loaded so far moves to a permanent generation the
+    # collector never walks, so workers don't dirty these pages
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Model {health.get('model_version')} loaded, "
+                    f"{gc.get_freeze_count()} objects frozen, forking {server.num_workers} workers")
+
+
+def post_worker_init(worker):
+    """Readiness check in each worker before it accepts connections"""
+    ready, health = check_ready(worker.wsgi)
+    if not ready:
+        worker.log.error(f"Worker {worker.pid} not ready: {health}")
+        sys.exit(3)  # gunicorn's WORKER_BOOT_ERROR, stops the master too
+
+
+def worker_exit(server, worker):
+    server.log.info(f"Worker {worker.pid} exiting after {worker.nr} requests")
+
+
+if __name__ == "__main__":
+    try:
+        from gunicorn.app.wsgiapp import run
+    except ImportError:
+        sys.exit("gunicorn is not available (it needs a Unix-like OS); use `python app.py` instead")
+    sys.argv = ['gunicorn', '-c', os.path.abspath(__file__), *sys.argv[1:], 'app:app']
+    run()
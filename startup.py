@@ -0,0 +1,84 @@
+"""Cold-start timing: how long each import and startup phase took
+
+Only the standard library is used here so the report can start before
+anything heavy is imported. app.py tracks its own imports with this,
+prints the report once it is ready and exports it on /api/metrics.
+"""
+import builtins
+import sys
+import threading
+import time
+
+
+class StartupReport:
+    """Import times per top-level module plus named startup phases"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports = {}
+        self.phases = {}
+        self.ready_seconds = None
+        self._original_import = None
+        self._depth = threading.local()
+
+    def track_imports(self):
+        """Time first-time imports until stop_tracking()
+
+        Nested imports are charged to the outermost one, so the numbers
+        add up to the time spent in the importing module's import lines.
+        """
+        self._original_import = builtins.__import__
+        original = self._original_import
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            depth = getattr(self._depth, 'value', 0)
+            if depth or level or name in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            self._depth.value = 1
+            started = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                self._depth.value = 0
+                root = name.partition('.')[0]
+                self.imports[root] = self.imports.get(root, 0.0) + time.perf_counter() - started
+
+        builtins.__import__ = timed_import
+        return self
+
+    def stop_tracking(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def phase(self, name, seconds):
+        self.phases[name] = seconds
+
+    def timed(self, name):
+        """Context manager recording the block's duration as a phase"""
+        return _Phase(self, name)
+
+    def ready(self):
+        """Mark startup finished; returns the total seconds"""
+        self.ready_seconds = time.perf_counter() - self.started
+        return self.ready_seconds
+
+    def summary(self, top=10):
+        lines = [f"Startup: {self.ready_seconds or time.perf_counter() - self.started:.3f}s"]
+        ranked = sorted(self.imports.items(), key=lambda item: -item[1])
+        lines.extend(f"  import {name:<24} {seconds * 1000:8.1f} ms" for name, seconds in ranked[:top])
+        lines.extend(f"  {name:<31} {seconds * 1000:8.1f} ms" for name, seconds in self.phases.items())
+        return '\n'.join(lines)
+
+
+class _Phase:
+    def __init__(self, report, name):
+        self.report = report
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.report.phase(self.name, time.perf_counter() - self.started)
@@ -0,0 +1,207 @@
+"""In-memory index of the built frontend, served with precompressed gzip
+
+The build directory is walked once: every file is read, hashed for a
+strong ETag and, for text assets, gzipped ahead of time, so a request is
+a dict lookup and never touches the disk. Filenames carrying a content
+hash (main.3f2a1b4c.js) are cached by browsers for a year; everything
+else, index.html included, is revalidated with its ETag and answered
+with a 304 when unchanged. A background thread re-scans the directory
+every ``recheck_seconds`` and swaps in a rebuilt index when any file's
+mtime or size changed, e.g. after `npm run build`; requests only ever
+read the current index.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+import time
+
+from flask import Response, send_file
+
+# Only text formats gain from gzip; images and fonts are compressed already
+COMPRESSIBLE_TYPES = {
+    'application/javascript', 'application/json', 'application/manifest+json',
+    'application/xml', 'image/svg+xml', 'text/javascript'
+}
+COMPRESS_MIN_BYTES = 1024
+
+# Larger files are indexed but streamed from disk instead of kept in memory
+MEMORY_MAX_BYTES = 8 * 1024 * 1024
+
+# Build tools put an 8+ hex digit content hash before the extension
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}(?:\.[A-Za-z0-9]+)+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+
+def _gunzip(data):
+    """Decompressed bytes, or None if data isn't valid gzip"""
+    try:
+        return gzip.decompress(data)
+    except (OSError, EOFError):
+        return None
+
+
+def _digest(path):
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+class StaticFile:
+    """One file of the build with everything needed to answer for it"""
+
+    def __init__(self, path, rel_path, stat):
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.mimetype = mimetypes.guess_type(rel_path)[0] or 'application/octet-stream'
+        hashed = HASHED_NAME.search(os.path.basename(rel_path)) is not None
+        self.cache_control = IMMUTABLE if hashed else REVALIDATE
+
+        self.data = None
+        self.gzip_data = None
+        if self.size > MEMORY_MAX_BYTES:
+            self.etag = _digest(path)
+            return
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        self.etag = hashlib.sha1(self.data).hexdigest()
+
+        if self.compressible and self.size >= COMPRESS_MIN_BYTES:
+            # A foo.js.gz emitted by the build wins over compressing here,
+            # unless it is older than foo.js and no longer matches it;
+            # mtime=0 keeps the bytes identical across restarts and workers
+            compressed = self._prebuilt_gzip(path, stat)
+            if compressed is None:
+                compressed = gzip.compress(self.data, compresslevel=9, mtime=0)
+            if len(compressed) < self.size:
+                self.gzip_data = compressed
+
+    def _prebuilt_gzip(self, path, stat):
+        """Contents of path + '.gz' if it is current, else None"""
+        try:
+            gz_stat = os.stat(path + '.gz')
+            with open(path + '.gz', 'rb') as f:
+                compressed = f.read()
+        except OSError:
+            return None
+        if gz_stat.st_mtime_ns >= stat.st_mtime_ns or _gunzip(compressed) == self.data:
+            return compressed
+        return None
+
+    @property
+    def compressible(self):
+        return self.mimetype.startswith('text/') or self.mimetype in COMPRESSIBLE_TYPES
+
+    def response(self, request):
+        """Response for request, gzipped if accepted and 304 if unchanged"""
+        if self.data is None:
+            response = send_file(self.path, mimetype=self.mimetype, etag=self.etag,
+                                 last_modified=self.mtime, conditional=True)
+            response.headers['Cache-Control'] = self.cache_control
+            return response
+
+        use_gzip = self.gzip_data is not None and request.accept_encodings['gzip'] > 0
+        response = Response(self.gzip_data if use_gzip else self.data, mimetype=self.mimetype)
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        if self.gzip_data is not None:
+            response.vary.add('Accept-Encoding')
+        # Strong ETags must differ between the two encodings of a file
+        response.set_etag(self.etag + '-gz' if use_gzip else self.etag)
+        response.last_modified = self.mtime
+        response.headers['Cache-Control'] = self.cache_control
+        return response.make_conditional(request)
+
+
+class StaticIndex:
+    """Files of a build directory by URL path, rebuilt when the directory changes
+
+    The index is built on first use (warm_caches does it at startup).
+    With recheck_seconds > 0, ensure_polling starts a thread that rebuilds
+    it when the directory changes; with 0 the startup index is served as is.
+    """
+
+    def __init__(self, root, recheck_seconds=2.0):
+        self.root = root
+        self.recheck_seconds = recheck_seconds
+        self._files = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self._poller_lock = threading.Lock()
+        self._poller_pid = None
+
+    def _scan(self):
+        """(url path, absolute path, stat) of every file under root"""
+        entries = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # removed mid-scan; the next check picks up the rest
+                rel_path = os.path.relpath(path, self.root).replace(os.sep, '/')
+                entries.append((rel_path, path, stat))
+        return entries
+
+    def files(self):
+        """Current {url path: StaticFile}, empty when there is no build"""
+        files = self._files
+        if files is None:
+            with self._lock:
+                # Another thread may have built it while we waited
+                if self._files is None:
+                    self._refresh()
+                files = self._files
+        return files
+
+    def refresh(self):
+        """Re-scan the directory and rebuild the index if anything changed"""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        entries = self._scan() if os.path.isdir(self.root) else []
+        signature = [(rel_path, stat.st_mtime_ns, stat.st_size) for rel_path, _, stat in entries]
+        if signature == self._signature:
+            return
+        files = {}
+        for rel_path, path, stat in entries:
+            try:
+                files[rel_path] = StaticFile(path, rel_path, stat)
+            except OSError:
+                continue
+        self._files = files
+        self._signature = signature
+
+    def ensure_polling(self):
+        """Start the directory watcher in this process if it isn't running
+
+        Cheap enough to call per request; forked workers get their own.
+        """
+        if self.recheck_seconds <= 0 or self._poller_pid == os.getpid():
+            return
+        with self._poller_lock:
+            if self._poller_pid == os.getpid():
+                return
+            self._poller_pid = os.getpid()
+        thread = threading.Thread(target=self._poll, name='static-poller', daemon=True)
+        thread.start()
+
+    def _poll(self):
+        while True:
+            time.sleep(self.recheck_seconds)
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Frontend index refresh failed, keeping the previous one: {e}")
+
+    def get(self, path):
+        return self.files().get(path)
@@ -0,0 +1,240 @@
+"""Seeded, vectorized generator of synthetic players
+
+Uses the same role-conditional ranges as /api/generate-demo-data, but
+draws every column for N players at once with a numpy Generator, so a
+million rows take seconds instead of minutes. Output can be written as
+CSV or as a columnar directory (read it back with columnar.read_columnar),
+in chunks so memory stays flat.
+
+Usage:
+    python synthetic.py 1000000 big_players.csv [--seed 42] [--price]
+    python synthetic.py 1000000 big_players.columns --format columnar --price
+"""
+import argparse
+import json
+import os
+import shutil
+
+import numpy as np
+
+from columnar import MANIFEST, FORMAT_VERSION, _code_dtype
+from model import FEATURE_COLUMNS, TARGET_COLUMN
+
+ROLES = ['Batsman', 'Bowler', 'All-Rounder', 'Wicket-Keeper']
+COUNTRIES = ['India', 'Australia', 'England', 'South Africa', 'New Zealand',
+             'West Indies', 'Pakistan', 'Sri Lanka', 'Bangladesh', 'Afghanistan']
+BATTING_STYLES = ['Right-Hand', 'Left-Hand']
+BOWLING_STYLES = ['Right-Arm Fast', 'Left-Arm Fast', 'Right-Arm Medium',
+                  'Left-Arm Medium', 'Right-Arm Spin', 'Left-Arm Spin',
+                  'Leg-Spin', 'Off-Spin']
+
+CATEGORIES = {
+    'role': ROLES,
+    'country': COUNTRIES,
+    'batting_style': BATTING_STYLES,
+    'bowling_style': BOWLING_STYLES
+}
+
+# (column, decimals or None for ints, range for the role, range otherwise)
+# Int ranges are [low, high) like np.random.randint; (0, 1) is always 0
+BATTING_STATS = [
+    ('innings_batted', None, (40, 200), (10, 80)),
+    ('runs_scored', None, (800, 8000), (50, 1500)),
+    ('batting_average', 2, (20.0, 55.0), (8.0, 25.0)),
+    ('batting_strike_rate', 2, (110.0, 180.0), (80.0, 140.0)),
+    ('hundreds', None, (0, 15), (0, 1)),
+    ('fifties', None, (0, 40), (0, 3)),
+    ('highest_score', None, (50, 180), (15, 65)),
+    ('boundary_percentage', 2, (8.0, 25.0), (5.0, 15.0)),
+]
+BOWLING_STATS = [
+    ('overs_bowled', 1, (200.0, 1200.0), (0.0, 50.0)),
+    ('wickets_taken', None, (30, 350), (0, 15)),
+    ('bowling_average', 2, (18.0, 35.0), (25.0, 45.0)),
+    ('economy_rate', 2, (6.5, 9.5), (7.0, 11.0)),
+    ('bowling_strike_rate', 2, (15.0, 25.0), (18.0, 35.0)),
+    ('five_wicket_hauls', None, (0, 8), (0, 1)),
+    ('best_bowling_wickets', None, (3, 7), (0, 3)),
+    ('dot_ball_percentage', 2, (35.0, 55.0), (25.0, 45.0)),
+]
+STUMPINGS = ('stumpings', None, (0, 40), (0, 3))
+COMMON_STATS = [
+    ('domestic_matches', None, (50, 250)),
+    ('catches', None, (10, 120)),
+    ('consistency_rating', 2, (40.0, 95.0)),
+    ('fitness_score', 2, (60.0, 98.0)),
+    ('experience_factor', 2, (30.0, 95.0)),
+    ('recent_form_rating', 2, (40.0, 95.0)),
+    ('match_winning_performances', None, (0, 25)),
+    ('pressure_handling_score', 2, (45.0, 98.0)),
+]
+
+# Cheapest and most expensive synthetic price, in lakhs
+PRICE_FLOOR = 20.0
+PRICE_CEILING = 2000.0
+
+
+def _draw(rng, n, decimals, bounds):
+    low, high = bounds
+    if decimals is None:
+        return rng.integers(low, high, n)
+    return np.round(rng.uniform(low, high, n), decimals)
+
+
+def _draw_by_mask(rng, mask, decimals, if_true, if_false):
+    """Draw from if_true where mask is set and from if_false elsewhere"""
+    out = np.empty(len(mask), dtype=np.int64 if decimals is None else np.float64)
+    out[mask] = _draw(rng, int(mask.sum()), decimals, if_true)
+    out[~mask] = _draw(rng, int((~mask).sum()), decimals, if_false)
+    return out
+
+
+def generate_players(n, rng=None, with_price=False):
+    """N synthetic players as a dict of numpy columns
+
+    Columns are in FEATURE_COLUMNS order; text columns are object arrays
+    of strings. Pass a seeded np.random.Generator for reproducible output.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    columns = {}
+    for name, values in CATEGORIES.items():
+        columns[name] = np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+
+    role = columns['role']
+    bats = role != 'Bowler'
+    bowls = (role == 'Bowler') | (role == 'All-Rounder')
+    keeps = role == 'Wicket-Keeper'
+
+    columns['age'] = rng.integers(20, 38, n)
+    for name, decimals, bounds in COMMON_STATS:
+        columns[name] = _draw(rng, n, decimals, bounds)
+    for name, decimals, if_true, if_false in BATTING_STATS:
+        columns[name] = _draw_by_mask(rng, bats, decimals, if_true, if_false)
+    for name, decimals, if_true, if_false in BOWLING_STATS:
+        columns[name] = _draw_by_mask(rng, bowls, decimals, if_true, if_false)
+    name, decimals, if_true, if_false = STUMPINGS
+    columns[name] = _draw_by_mask(rng, keeps, decimals, if_true, if_false)
+
+    players = {name: columns[name] for name in FEATURE_COLUMNS}
+    if with_price:
+        players[TARGET_COLUMN] = synthetic_price(players, rng)
+    return players
+
+
+def synthetic_price(players, rng):
+    """Plausible auction price in lakhs for generated players
+
+    A weighted 0-1 score of batting, bowling and form, mapped
+    exponentially onto PRICE_FLOOR..PRICE_CEILING with log-normal noise.
+    """
+    batting = (players['batting_average'] / 55.0 + players['batting_strike_rate'] / 180.0
+               + players['runs_scored'] / 8000.0) / 3.0
+    bowling = (players['wickets_taken'] / 350.0 + (11.0 - players['economy_rate']) / 4.5) / 2.0
+    form = (players['consistency_rating'] + players['recent_form_rating']
+            + players['pressure_handling_score']) / 300.0
+    impact = players['match_winning_performances'] / 25.0
+
+    score = np.clip(0.3 * np.maximum(batting, bowling) + 0.15 * np.minimum(batting, bowling)
+                    + 0.35 * form + 0.2 * impact, 0.0, 1.0)
+    ratio = PRICE_CEILING / PRICE_FLOOR
+    price = PRICE_FLOOR * ratio ** score * rng.lognormal(0.0, 0.35, len(score))
+    return np.round(np.clip(price, PRICE_FLOOR, PRICE_CEILING), 2)
+
+
+def to_records(players):
+    """Columns -> list of JSON-ready dicts with plain Python values"""
+    names = list(players)
+    lists = [players[name].tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*lists)]
+
+
+def _chunks(n, chunksize, seed, with_price):
+    rng = np.random.default_rng(seed)
+    start = 0
+    while start < n:
+        size = min(chunksize, n - start)
+        yield start, generate_players(size, rng, with_price)
+        start += size
+
+
+def write_csv(path, n, seed=None, chunksize=100000, with_price=False):
+    """Write n players to a CSV with player_name first, like players_dataset.csv"""
+    import pandas as pd
+
+    with open(path, 'w', newline='') as f:
+        for start, players in _chunks(n, chunksize, seed, with_price):
+            df = pd.DataFrame(players)
+            df.insert(0, 'player_name', [f'Player {i}' for i in range(start + 1, start + len(df) + 1)])
+            df.to_csv(f, index=False, header=start == 0)
+    return path
+
+
+def write_columnar(directory, n, seed=None, chunksize=100000, with_price=False):
+    """Write n players as a columnar directory readable by read_columnar
+
+    Every column is preallocated as an .npy file and filled chunk by
+    chunk. Text columns are stored as codes into their sorted vocabulary,
+    the same layout columnar.build_columnar_cache produces; player names
+    are left out.
+    """
+    tmp = f'{directory}.tmp-{os.getpid()}'
+    os.makedirs(tmp, exist_ok=True)
+    try:
+        arrays = {}
+        entries = []
+        vocabularies = {name: sorted(values) for name, values in CATEGORIES.items()}
+        for start, players in _chunks(n, chunksize, seed, with_price):
+            if not arrays:
+                for i, name in enumerate(players):
+                    entry = {'name': name, 'file': f'{i:03d}.npy'}
+                    if name in vocabularies:
+                        entry['kind'] = 'category'
+                        entry['categories'] = vocabularies[name]
+                        dtype = _code_dtype(len(vocabularies[name]))
+                    else:
+                        entry['kind'] = 'numeric'
+                        dtype = players[name].dtype
+                    arrays[name] = np.lib.format.open_memmap(
+                        os.path.join(tmp, entry['file']), mode='w+', dtype=dtype, shape=(n,))
+                    entries.append(entry)
+
+            stop = start + len(players['age'])
+            for name, values in players.items():
+                if name in vocabularies:
+                    values = np.searchsorted(vocabularies[name], values)
+                arrays[name][start:stop] = values
+
+        for array in arrays.values():
+            array.flush()
+        arrays.clear()
+
+        with open(os.path.join(tmp, MANIFEST), 'w') as f:
+            json.dump({
+                'format_version': FORMAT_VERSION,
+                'source': 'synthetic',
+                'source_version': f'seed-{seed}',
+                'rows': n,
+                'columns': entries
+            }, f)
+
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.rename(tmp, directory)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return directory
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic IPL players")
+    parser.add_argument('n', type=int, help="number of players")
+    parser.add_argument('output', help="CSV path, or directory with --format columnar")
+    parser.add_argument('--format', choices=['csv', 'columnar'], default='csv')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=100000)
+    parser.add_argument('--price', action='store_true', help=f"add a synthetic {TARGET_COLUMN}")
+    args = parser.parse_args()
+
+    writer = write_columnar if args.format == 'columnar' else write_csv
+    writer(args.output, args.n, seed=args.seed, chunksize=args.chunksize, with_price=args.price)
+    print(f"Wrote {args.n} players to {args.output}")
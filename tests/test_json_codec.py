@@ -0,0 +1,44 @@
+import json
+
+import pytest
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+import json_codec
+
+pytest.importorskip('orjson')
+
+PAYLOAD = {'success': True, 'prediction': {'predicted_price': 242.5, 'confidence': float('nan')}}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    app = Flask(__name__)
+    assert json_codec.install(app)
+
+    def stdlib_dumps(self, obj, **kwargs):
+        raise AssertionError(f'fell back to json.dumps with {kwargs}')
+
+    monkeypatch.setattr(DefaultJSONProvider, 'dumps', stdlib_dumps)
+    return app
+
+
+def test_jsonify_goes_through_orjson(app):
+    with app.app_context():
+        body = jsonify(PAYLOAD).get_data(as_text=True)
+
+    assert body == '{"prediction":{"confidence":null,"predicted_price":242.5},"success":true}\n'
+
+
+def test_debug_indent_goes_through_orjson(app):
+    app.debug = True
+    with app.app_context():
+        body = jsonify(PAYLOAD).get_data(as_text=True)
+
+    assert body.startswith('{\n  "prediction": {\n')
+    assert json.loads(body) == {'success': True, 'prediction': {'predicted_price': 242.5, 'confidence': None}}
+
+
+def test_other_kwargs_fall_back(app, monkeypatch):
+    monkeypatch.undo()
+    assert app.json.dumps({'b': 1, 'a': 2}, indent=4) == json.dumps({'a': 2, 'b': 1}, indent=4)
@@ -0,0 +1,108 @@
+import csv
+import os
+import shutil
+import struct
+
+import numpy as np
+import pytest
+
+from model import BUNDLE_FILE, LEGACY_PICKLES, IPLAuctionPredictor
+from model_bundle import FORMAT_VERSION, BundleError, read_bundle, read_header, write_bundle
+
+ARTIFACTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'model_artifacts')
+SAMPLE_PLAYER = os.path.join(os.path.dirname(ARTIFACTS), 'sample_player.csv')
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    arrays = {
+        'theta': np.arange(12, dtype=np.float64).reshape(3, 4),
+        'classes': np.array([0, 1, 2], dtype=np.int64),
+        'bins': np.linspace(20.0, 2000.0, 5, dtype=np.float32)
+    }
+    metadata = {'feature_columns': ['age', 'role'], 'categories': {'role': ['Batsman', 'Bowler']}}
+    path = str(tmp_path / BUNDLE_FILE)
+    header = write_bundle(path, arrays, metadata)
+    return path, arrays, metadata, header
+
+
+def _rewrite(path, transform):
+    with open(path, 'rb') as f:
+        data = bytearray(f.read())
+    with open(path, 'wb') as f:
+        f.write(transform(data))
+
+
+def test_round_trip(bundle):
+    path, arrays, metadata, header = bundle
+
+    loaded, loaded_header = read_bundle(path)
+
+    assert loaded.keys() == arrays.keys()
+    for name, array in arrays.items():
+        assert loaded[name].dtype == array.dtype
+        np.testing.assert_array_equal(loaded[name], array)
+        assert not loaded[name].flags.writeable
+    for key, value in metadata.items():
+        assert loaded_header[key] == value
+    assert loaded_header['model_version'] == header['model_version'] == header['checksum'][:12]
+    assert read_header(path) == loaded_header
+
+
+@pytest.mark.parametrize('keep', [4, 40, -8])
+def test_truncated(bundle, keep):
+    path = bundle[0]
+    _rewrite(path, lambda data: data[:keep])
+
+    with pytest.raises(BundleError, match='is truncated'):
+        read_bundle(path)
+
+
+def test_corrupted_payload(bundle):
+    path = bundle[0]
+
+    def flip_last_bit(data):
+        data[-1] ^= 1
+        return data
+    _rewrite(path, flip_last_bit)
+
+    with pytest.raises(BundleError, match='failed its checksum'):
+        read_bundle(path)
+    # verify=False skips the check and maps the arrays anyway
+    read_bundle(path, verify=False)
+
+
+def test_wrong_magic(bundle):
+    path = bundle[0]
+    _rewrite(path, lambda data: b'NOTMODEL' + data[8:])
+
+    with pytest.raises(BundleError, match='is not a model bundle'):
+        read_bundle(path)
+
+
+def test_unsupported_version(bundle):
+    path = bundle[0]
+    _rewrite(path, lambda data: data[:8] + struct.pack('<I', FORMAT_VERSION + 1) + data[12:])
+
+    with pytest.raises(BundleError, match=f'Unsupported bundle format version {FORMAT_VERSION + 1}'):
+        read_bundle(path)
+
+
+def test_load_model_falls_back_to_legacy_pickles(tmp_path):
+    legacy_dir = tmp_path / 'legacy'
+    legacy_dir.mkdir()
+    for name in LEGACY_PICKLES:
+        shutil.copy(os.path.join(ARTIFACTS, f'{name}.pkl'), legacy_dir)
+    with open(SAMPLE_PLAYER, newline='') as f:
+        player = next(csv.DictReader(f))
+
+    legacy = IPLAuctionPredictor()
+    legacy.load_model(str(legacy_dir))
+    assert legacy.model_version.startswith('legacy-')
+
+    # Saving the legacy model as a bundle gives the same predictions
+    legacy.save_model(str(tmp_path / 'bundle'))
+    bundled = IPLAuctionPredictor()
+    bundled.load_model(str(tmp_path / 'bundle'))
+    assert not bundled.model_version.startswith('legacy-')
+    assert bundled.predict(player) == legacy.predict(player)
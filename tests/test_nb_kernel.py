@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from sklearn.naive_bayes import GaussianNB
+from sklearn.preprocessing import StandardScaler
+
+from nb_kernel import FusedGaussianNB
+from synthetic import CATEGORIES, generate_players
+from model import FEATURE_COLUMNS, TARGET_COLUMN
+
+
+@pytest.fixture(scope='module')
+def fitted():
+    players = generate_players(5000, np.random.default_rng(0), with_price=True)
+    for col, labels in CATEGORIES.items():
+        codes = {label: code for code, label in enumerate(sorted(labels))}
+        players[col] = np.array([codes[label] for label in players[col]])
+    X = np.column_stack([players[col] for col in FEATURE_COLUMNS]).astype(np.float64)
+    prices = players[TARGET_COLUMN]
+    y = np.digitize(prices, np.percentile(prices, np.linspace(0, 100, 21))[1:-1])
+
+    scaler = StandardScaler().fit(X)
+    model = GaussianNB().fit(scaler.transform(X), y)
+    return scaler, model, X
+
+
+def test_float64_matches_sklearn(fitted):
+    scaler, model, X = fitted
+    expected = model.predict_proba(scaler.transform(X))
+    kernel = FusedGaussianNB.from_estimators(scaler, model)
+
+    np.testing.assert_allclose(kernel.predict_proba(X), expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(kernel.predict(X), model.classes_[expected.argmax(axis=1)])
+
+
+def test_float32_matches_sklearn(fitted):
+    scaler, model, X = fitted
+    expected = model.predict_proba(scaler.transform(X))
+    proba = FusedGaussianNB.from_estimators(scaler, model, dtype=np.float32).predict_proba(X)
+
+    assert proba.dtype == np.float32
+    np.testing.assert_array_equal(proba.argmax(axis=1), expected.argmax(axis=1))
+    np.testing.assert_allclose(proba, expected, rtol=0, atol=1e-5)
+
+
+def test_from_params_matches_from_estimators(fitted):
+    scaler, model, X = fitted
+    kernel = FusedGaussianNB.from_params(scaler.mean_, scaler.scale_, model.theta_, model.var_,
+                                         model.class_prior_, model.classes_)
+
+    np.testing.assert_array_equal(kernel.predict_proba(X),
+                                  FusedGaussianNB.from_estimators(scaler, model).predict_proba(X))
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from schema import ROW_AT_A_TIME_MAX, PlayerSchema
+
+
+@pytest.fixture
+def schema():
+    return PlayerSchema(['age', 'role', 'runs_scored'], {'role': ['Batsman', 'Bowler']}, [0.0, 0.5, 0.0])
+
+
+def test_encode_fills_missing_numbers_and_reports_unknown_category(schema):
+    X, report = schema.encode({'age': None, 'role': 'Umpire', 'runs_scored': '4500'})
+
+    np.testing.assert_array_equal(X, [[0.0, 0.5, 4500.0]])
+    assert report == {'unknown_categories': {'role': 'Umpire'}}
+
+
+@pytest.mark.parametrize('value', [float('inf'), float('-inf'), 'inf', '-Infinity', 1e309])
+def test_encode_rejects_non_finite(schema, value):
+    with pytest.raises(ValueError, match='Invalid age'):
+        schema.encode({'age': value, 'role': 'Batsman', 'runs_scored': 10})
+
+
+@pytest.mark.parametrize('n_rows', [3, ROW_AT_A_TIME_MAX + 1])
+def test_encode_batch_flags_non_finite_rows(schema, n_rows):
+    players = [{'age': 25, 'role': 'Bowler', 'runs_scored': 10} for _ in range(n_rows)]
+    players[1] = {'age': 25, 'role': 'Bowler', 'runs_scored': 'inf'}
+
+    X, errors, _ = schema.encode_batch(players)
+
+    assert errors[0] == [] and errors[-1] == []
+    assert len(errors[1]) == 1 and errors[1][0].startswith('Invalid runs_scored')
+    assert np.isfinite(X[0]).all()
+
+
+def test_encode_batch_flags_non_finite_columns(schema):
+    columns = {'age': np.array([25.0, np.inf]), 'role': ['Batsman', 'Bowler'], 'runs_scored': [10, None]}
+
+    X, errors, _ = schema.encode_batch(columns)
+
+    assert errors[0] == []
+    assert errors[1] == ['Invalid age: inf']
+    np.testing.assert_array_equal(X[0], [25.0, 0.0, 10.0])
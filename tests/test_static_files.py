@@ -0,0 +1,42 @@
+import gzip
+import os
+
+from static_files import StaticIndex
+
+SOURCE = b'console.log("new build");\n' * 100
+
+
+def _write(path, data, mtime_ns):
+    with open(path, 'wb') as f:
+        f.write(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_stale_prebuilt_gzip_is_ignored(tmp_path):
+    _write(tmp_path / 'main.js', SOURCE, 2_000_000_000)
+    _write(tmp_path / 'main.js.gz', gzip.compress(b'old build'), 1_000_000_000)
+
+    static_file = StaticIndex(str(tmp_path)).get('main.js')
+
+    assert gzip.decompress(static_file.gzip_data) == SOURCE
+
+
+def test_prebuilt_gzip_is_used_when_current(tmp_path):
+    prebuilt = gzip.compress(SOURCE, mtime=123)
+    _write(tmp_path / 'main.js', SOURCE, 2_000_000_000)
+    _write(tmp_path / 'main.js.gz', prebuilt, 1_000_000_000)
+
+    # Older than the source but still matching it
+    assert StaticIndex(str(tmp_path)).get('main.js').gzip_data == prebuilt
+
+
+def test_index_is_only_rebuilt_by_refresh(tmp_path):
+    _write(tmp_path / 'index.html', b'<p>one</p>', 1_000_000_000)
+    index = StaticIndex(str(tmp_path), recheck_seconds=0)
+    assert index.get('index.html').data == b'<p>one</p>'
+
+    _write(tmp_path / 'index.html', b'<p>two</p>', 2_000_000_000)
+    assert index.get('index.html').data == b'<p>one</p>'
+
+    index.refresh()
+    assert index.get('index.html').data == b'<p>two</p>'
@@ -0,0 +1,91 @@
+import io
+import json
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('MODEL_DIR', os.path.join(ROOT, 'model_artifacts'))
+
+import app as app_module  # noqa: E402
+
+with open(os.path.join(ROOT, 'sample_player.csv')) as f:
+    HEADER, SAMPLE_ROW = f.read().splitlines()[:2]
+HEADER, SAMPLE_ROW = 'player_name,' + HEADER, 'A. Player,' + SAMPLE_ROW
+COLUMNS = HEADER.split(',')
+
+
+def _row(**overrides):
+    values = dict(zip(COLUMNS, SAMPLE_ROW.split(',')))
+    values.update({key: str(value) for key, value in overrides.items()})
+    return ','.join(values[col] for col in COLUMNS)
+
+
+def _csv(*rows):
+    return '\n'.join([HEADER, *rows]) + '\n'
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def _upload(client, text, query=''):
+    response = client.post(f'/api/upload-csv{query}',
+                           data={'file': (io.BytesIO(text.encode()), 'players.csv')})
+    return response
+
+
+def _stream(client, text, chunksize=2):
+    response = _upload(client, text, f'?score=all&chunksize={chunksize}')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_streams_every_row_then_summary(client):
+    lines = _stream(client, _csv(*[_row(age=20 + i) for i in range(5)]))
+
+    assert [line['row'] for line in lines[:-1]] == [0, 1, 2, 3, 4]
+    assert all(line['player_name'] == 'A. Player' for line in lines[:-1])
+    assert all(line['success'] and line['prediction']['predicted_price'] > 0 for line in lines[:-1])
+    assert lines[-1] == {'done': True, 'total_rows': 5, 'failed': 0, 'missing_columns': None}
+
+
+def test_malformed_row_ends_stream_with_parse_error(client):
+    # The third chunk never tokenizes
+    lines = _stream(client, _csv(_row(), _row(), _row(), '"unterminated'))
+
+    assert [line['row'] for line in lines[:-1]] == [0, 1]
+    assert lines[-1]['success'] is False
+    assert lines[-1]['error'].startswith('Error reading CSV file: ')
+
+
+def test_row_that_fails_scoring_is_reported_inline(client):
+    lines = _stream(client, _csv(_row(), _row(age='inf'), _row()))
+
+    assert lines[1] == {'row': 1, 'player_name': 'A. Player', 'success': False, 'error': 'Invalid age: inf'}
+    assert lines[0]['success'] and lines[2]['success']
+    assert lines[-1] == {'done': True, 'total_rows': 3, 'failed': 1, 'missing_columns': None}
+
+
+def test_scoring_failure_ends_stream_with_scoring_error(client, monkeypatch):
+    def broken_predict_batch(players):
+        raise RuntimeError('kernel exploded')
+    monkeypatch.setattr(app_module.model_manager.predictor, 'predict_batch', broken_predict_batch)
+
+    lines = _stream(client, _csv(_row(), _row(), _row()))
+
+    assert lines == [{'success': False, 'error': 'Error scoring rows 0-1: kernel exploded'}]
+
+
+def test_preview_keeps_int_zero_for_missing_and_non_numeric_cells(client):
+    response = _upload(client, _csv(_row(innings_batted='abc', highest_score='', bowling_style='')))
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['total_rows'] == 1
+    data = body['data']
+    for field in ('innings_batted', 'highest_score', 'bowling_style'):
+        assert data[field] == 0 and type(data[field]) is int
+    assert data['age'] == 28.0 and data['role'] == 'Batsman'
@@ -0,0 +1,181 @@
+"""Cross-validated sweep over price binning and GaussianNB var_smoothing
+
+The dataset is preprocessed once in the parent process and placed in
+shared memory; worker processes attach to it by name, so no task pickles
+the feature matrix. Every config runs the same k folds, the results are
+ranked and the winning config is refit on all rows and saved.
+
+Usage:
+    python tune.py [--data players_dataset.csv] [--folds 5] [--workers 8]
+                   [--bins 10 20 30] [--strategies percentile uniform]
+                   [--var-smoothing 1e-9 1e-5] [--rank-by mae] [--no-save]
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from sklearn.metrics import mean_absolute_error, r2_score, mean_squared_error
+from sklearn.model_selection import KFold
+from sklearn.naive_bayes import GaussianNB
+
+from columnar import load_dataset
+from model import IPLAuctionPredictor, TARGET_COLUMN
+
+DEFAULT_BINS = [10, 15, 20, 25, 30, 40]
+DEFAULT_STRATEGIES = ['percentile', 'uniform']
+DEFAULT_VAR_SMOOTHING = [1e-9, 1e-7, 1e-5, 1e-3, 1e-1]
+
+# Arrays shared with the workers, attached once per process
+_shared = {}
+
+
+def _share(array):
+    """Copy array into a new shared memory block"""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    view[...] = array
+    return block, {'name': block.name, 'shape': array.shape, 'dtype': array.dtype.str}
+
+
+def _attach(specs):
+    """Pool initializer: map the parent's shared arrays into this worker"""
+    for key, spec in specs.items():
+        block = shared_memory.SharedMemory(name=spec['name'])
+        _shared[key + '_block'] = block
+        _shared[key] = np.ndarray(spec['shape'], dtype=spec['dtype'], buffer=block.buf)
+
+
+def evaluate_config(config):
+    """k-fold MAE/RMSE/R² for one (n_bins, strategy, var_smoothing)"""
+    n_bins, strategy, var_smoothing = config
+    X, prices, folds = _shared['X'], _shared['prices'], _shared['folds']
+    started = time.perf_counter()
+
+    scores = []
+    for fold in range(int(folds.max()) + 1):
+        test = folds == fold
+        train = ~test
+
+        # Bin edges come from the training fold only
+        binner = IPLAuctionPredictor()
+        y_train = binner.create_price_bins(prices[train], n_bins=n_bins, strategy=strategy)
+        y_test = binner._price_to_bin(prices[test])
+        midpoints = binner._bin_midpoints()
+
+        model = GaussianNB(var_smoothing=var_smoothing)
+        model.fit(X[train], y_train)
+        y_pred = model.predict(X[test])
+
+        # Same evaluation as IPLAuctionPredictor.train: bin prices vs bin prices
+        y_test_prices = midpoints[y_test]
+        y_pred_prices = midpoints[y_pred]
+        scores.append((
+            mean_absolute_error(y_test_prices, y_pred_prices),
+            np.sqrt(mean_squared_error(y_test_prices, y_pred_prices)),
+            r2_score(y_test_prices, y_pred_prices)
+        ))
+
+    mae, rmse, r2 = np.mean(scores, axis=0)
+    return {
+        'n_bins': n_bins,
+        'strategy': strategy,
+        'var_smoothing': var_smoothing,
+        'mae': float(mae),
+        'rmse': float(rmse),
+        'r2': float(r2),
+        'seconds': time.perf_counter() - started
+    }
+
+
+def sweep(csv_path, grid, n_folds=5, workers=None, random_state=42):
+    """Run every config in grid; returns (predictor, X, prices, results)
+
+    Results are in grid order. The predictor comes back with its encoders
+    and scaler fitted on all rows, ready for refit_best(X, prices).
+    """
+    predictor = IPLAuctionPredictor()
+    df = load_dataset(csv_path)
+    X = np.ascontiguousarray(predictor.preprocess_data(df, fit=True), dtype=np.float64)
+    prices = df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+
+    folds = np.empty(len(prices), dtype=np.int8)
+    splitter = KFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+    for fold, (_, test_index) in enumerate(splitter.split(X)):
+        folds[test_index] = fold
+
+    blocks = []
+    specs = {}
+    try:
+        for key, array in (('X', X), ('prices', prices), ('folds', folds)):
+            block, specs[key] = _share(array)
+            blocks.append(block)
+
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 initializer=_attach, initargs=(specs,)) as pool:
+            results = list(pool.map(evaluate_config, grid))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return predictor, X, prices, results
+
+
+def refit_best(predictor, X, prices, best):
+    """Fit the winning config on every row"""
+    y = predictor.create_price_bins(prices, n_bins=best['n_bins'], strategy=best['strategy'])
+    predictor.model = GaussianNB(var_smoothing=best['var_smoothing'])
+    predictor.model.fit(X, y)
+    predictor.is_trained = True
+    predictor._prepare_inference()
+    return predictor
+
+
+def print_table(results):
+    print(f"{'rank':>4}  {'bins':>4}  {'strategy':<10}  {'var_smoothing':>13}  "
+          f"{'MAE':>9}  {'RMSE':>9}  {'R²':>8}  {'time':>7}")
+    for rank, r in enumerate(results, 1):
+        print(f"{rank:>4}  {r['n_bins']:>4}  {r['strategy']:<10}  {r['var_smoothing']:>13.0e}  "
+              f"{r['mae']:>9.2f}  {r['rmse']:>9.2f}  {r['r2']:>8.4f}  {r['seconds']:>6.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-validated hyperparameter sweep")
+    parser.add_argument('--data', default='players_dataset.csv', help="training CSV")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument('--bins', type=int, nargs='+', default=DEFAULT_BINS)
+    parser.add_argument('--strategies', nargs='+', default=DEFAULT_STRATEGIES,
+                        choices=DEFAULT_STRATEGIES)
+    parser.add_argument('--var-smoothing', type=float, nargs='+', default=DEFAULT_VAR_SMOOTHING)
+    parser.add_argument('--rank-by', choices=['mae', 'rmse', 'r2'], default='mae')
+    parser.add_argument('--output', help="also write the ranked results to this JSON file")
+    parser.add_argument('--model-dir', default='model_artifacts')
+    parser.add_argument('--no-save', action='store_true', help="don't save the winning model")
+    args = parser.parse_args()
+
+    grid = list(itertools.product(args.bins, args.strategies, args.var_smoothing))
+    print(f"Evaluating {len(grid)} configs with {args.folds}-fold CV...")
+
+    started = time.perf_counter()
+    predictor, X, prices, results = sweep(args.data, grid, n_folds=args.folds, workers=args.workers)
+    results.sort(key=lambda r: -r['r2'] if args.rank_by == 'r2' else r[args.rank_by])
+    print(f"Sweep finished in {time.perf_counter() - started:.1f}s\n")
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    best = results[0]
+    print(f"\nBest: n_bins={best['n_bins']}, strategy={best['strategy']}, "
+          f"var_smoothing={best['var_smoothing']:.0e}")
+
+    if not args.no_save:
+        refit_best(predictor, X, prices, best)
+        predictor.save_model(args.model_dir)
@@ -0,0 +1,192 @@
+import threading
+
+import numpy as np
+
+# Columns /api/rankings can sort by
+SORT_KEYS = ['predicted_price', 'confidence', 'actual_price', 'residual']
+# Columns it can filter by, each with its own pre-sorted orders
+GROUP_COLUMNS = ['role', 'country']
+
+
+class ValuationTable:
+    """Every dataset row scored once, with orders pre-sorted for ranking
+
+    ``residual`` is actual minus predicted price, so the most undervalued
+    players come first when sorting by residual ascending. For each sort
+    key the table keeps one descending order per filter combination (all,
+    per role, per country, per role and country), so a query is a slice.
+    """
+
+    def __init__(self, df, predictor, key=None):
+        import pandas as pd
+
+        self.key = key
+        self.model_version = predictor.model_version
+
+        X, known = predictor._encode_frame(df)
+        self.rows = np.flatnonzero(known)
+
+        # Plain per-column arrays, records are assembled from these much
+        # faster than DataFrame.iloc(...).to_dict()
+        self.columns = {}
+        for col in df.columns:
+            values = df[col].to_numpy()[known]
+            if values.dtype == object:
+                values = np.where(pd.isna(values), None, values)
+            self.columns[col] = values
+
+        proba = predictor._kernel.predict_proba(X[known])
+        best = proba.argmax(axis=1)
+        bins = predictor._kernel.classes[best]
+        actual = df['auction_price_lakhs'].to_numpy(dtype=np.float64)[known]
+        predicted = np.round(predictor._bin_midpoints()[bins], 2)
+        self.values = {
+            'predicted_price': predicted,
+            'confidence': np.round(proba[np.arange(len(best)), best] * 100, 2),
+            'actual_price': actual,
+            'residual': np.round(actual - predicted, 2)
+        }
+
+        self.groups = {}
+        for col in GROUP_COLUMNS:
+            codes, labels = pd.factorize(df[col].astype(str).to_numpy()[known])
+            self.groups[col] = (codes, {label: code for code, label in enumerate(labels)})
+
+        # Keyed by (sort, role code or None, country code or None)
+        role_codes, roles = self.groups['role']
+        country_codes, countries = self.groups['country']
+        self.orders = {}
+        for sort in SORT_KEYS:
+            order = np.argsort(-self.values[sort], kind='stable')
+            self.orders[(sort, None, None)] = order
+            for country in countries.values():
+                self.orders[(sort, None, country)] = order[country_codes[order] == country]
+            for role in roles.values():
+                role_order = order[role_codes[order] == role]
+                self.orders[(sort, role, None)] = role_order
+                for country in countries.values():
+                    self.orders[(sort, role, country)] = role_order[country_codes[role_order] == country]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _code(self, col, label):
+        labels = self.groups[col][1]
+        if label not in labels:
+            raise ValueError(f"Unknown {col}: '{label}'")
+        return labels[label]
+
+    def query(self, role=None, country=None, sort='predicted_price', descending=True, page=1, per_page=20):
+        """One page of players ranked by sort, optionally filtered
+
+        Returns (records, total matching players).
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of: {', '.join(SORT_KEYS)}")
+        if page < 1 or per_page < 1:
+            raise ValueError("page and per_page must be positive")
+
+        order = self.orders[(
+            sort,
+            None if role is None else self._code('role', role),
+            None if country is None else self._code('country', country)
+        )]
+
+        if not descending:
+            order = order[::-1]
+        start = (page - 1) * per_page
+        picked = order[start:start + per_page]
+
+        names = list(self.columns) + ['rank'] + list(self.values)
+        columns = [values[picked].tolist() for values in self.columns.values()]
+        columns.append(list(range(start + 1, start + len(picked) + 1)))
+        columns += [values[picked].tolist() for values in self.values.values()]
+        records = [dict(zip(names, row)) for row in zip(*columns)]
+        return records, len(order)
+
+
+class ValuationCache:
+    """Keeps a ValuationTable for the live model and dataset
+
+    The first table is built on demand. After that, a model swap or a
+    dataset change starts a rebuild in a background thread while queries
+    keep being answered from the previous table.
+    """
+
+    def __init__(self, dataset_cache, model_manager):
+        self.dataset_cache = dataset_cache
+        self.model_manager = model_manager
+        self._table = None
+        self._lock = threading.Lock()
+        self._first_build_lock = threading.Lock()
+        # Rebuild requests are numbered so an older build never wins
+        self._requested = 0
+        self._installed = 0
+        self._building_key = None
+        self._failed_key = None
+        self.last_error = None
+
+    def _current(self):
+        snapshot = self.dataset_cache.get()
+        predictor = self.model_manager.predictor
+        return snapshot, predictor, (snapshot.etag, predictor.model_version)
+
+    def _build(self, snapshot, predictor, key, generation):
+        table = ValuationTable(snapshot.df, predictor, key)
+        with self._lock:
+            if generation > self._installed:
+                self._table = table
+                self._installed = generation
+            if self._building_key == key:
+                self._building_key = None
+        print(f"Valuation table built for {len(table)} players (model {predictor.model_version})")
+        return table
+
+    def refresh(self):
+        """Start a background rebuild if the model or dataset changed"""
+        snapshot, predictor, key = self._current()
+        if not predictor.is_trained:
+            return
+        with self._lock:
+            table = self._table
+            # Already current, already building, or already failed for this key
+            if (table is not None and table.key == key) or key in (self._building_key, self._failed_key):
+                return
+            self._requested += 1
+            generation = self._requested
+            self._building_key = key
+
+        def run():
+            try:
+                self._build(snapshot, predictor, key, generation)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Valuation table rebuild failed: {e}")
+                with self._lock:
+                    self._failed_key = key
+                    if self._building_key == key:
+                        self._building_key = None
+
+        threading.Thread(target=run, name='valuation-rebuild', daemon=True).start()
+
+    def get(self):
+        """Current table and whether it is stale while a rebuild runs"""
+        snapshot, predictor, key = self._current()
+        if not predictor.is_trained:
+            raise ValueError("Model not trained. Please train the model first.")
+
+        table = self._table
+        if table is None:
+            # Nothing to serve yet, the first request builds it
+            with self._first_build_lock:
+                table = self._table
+                if table is None:
+                    with self._lock:
+                        self._requested += 1
+                        generation = self._requested
+                    table = self._build(snapshot, predictor, key, generation)
+        if table.key != key:
+            self.refresh()
+            return table, True
+        return table, False